@@ -13,10 +13,45 @@ SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 800
 BACKGROUND_COLOR = (0, 0, 0)
 
+# 世界设置（世界坐标独立于屏幕坐标，默认与窗口一致）
+WORLD_CONFIG = {
+    'width': SCREEN_WIDTH,
+    'height': SCREEN_HEIGHT,
+    'star_pos': [SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2],  # 主恒星系统位置
+    'ship_start': [100, SCREEN_HEIGHT - 100],  # 飞船出生点
+    'index_cell_size': 400,  # 空间索引网格边长
+    # 其他恒星系统（参与引力和碰撞），例如：
+    # {'pos': [3000, 1200], 'mass': 2e5, 'radius': 70}
+    'extra_stars': []
+}
+
+# 摄像机设置
+CAMERA_CONFIG = {
+    'zoom': 1.0,
+    'min_zoom': 0.25,
+    'max_zoom': 2.0,
+    'zoom_step': 1.1,          # 每帧按键缩放倍率
+    'follow_smoothing': 0.1    # 跟随平滑系数（1 为立即跟随）
+}
+
 # 物理常数
 GRAVITY_CONSTANT = 0.5  # 引力常数（简化版）
 TIME_STEP = 0.1  # 时间步长
 
+# 物理内核配置
+PHYSICS_CONFIG = {
+    'backend': 'auto'  # 'auto'（有 numba 则使用）、'numba' 或 'numpy'
+}
+
+# 引力场缓存配置（静态天体的加速度预计算网格）
+GRAVITY_FIELD_CONFIG = {
+    'enabled': False,       # 是否使用预计算引力场
+    'cell_size': 4,         # 网格间距（像素）
+    'exact_radius': 80,     # 距天体中心小于该距离时使用精确计算
+    'show_overlay': False,  # 是否显示引力势阱叠加层
+    'overlay_alpha': 90     # 叠加层透明度（0-255）
+}
+
 # 恒星配置
 STAR_CONFIG = {
     'texture': os.path.join(ASSETS_PATH, 'images/star.png') if USE_TEXTURES else None,
@@ -48,7 +83,8 @@ DISTURBER_CONFIG = {
     'orbit_radius': 180,         # 公转轨道半径
     'angular_speed': 0.005,      # 公转角速度（弧度/帧）
     'rotation_speed': 1.2,       # 自转角速度（度/帧）
-    'texture_scale': 0.5         # 贴图显示缩放系数（相对碰撞半径）
+    'texture_scale': 0.5,        # 贴图显示缩放系数（相对碰撞半径）
+    'color': (200, 120, 80)      # 矢量图形模式下的颜色
 }
 
 # 飞船配置
@@ -67,6 +103,16 @@ SHIP_CONFIG = {
 
 }
 
+# 多飞船共享世界配置（0 表示只有玩家飞船）
+FLEET_CONFIG = {
+    'count': 0,                   # 自动驾驶/智能体飞船数量
+    'respawn_delay': 60,          # 结束后重生等待（帧）
+    'spawn_margin': 40,           # 出生点与世界边缘、恒星表面及其他飞船的最小距离
+    'autopilot_thrust_prob': 0.3, # 自动驾驶对准目标后每帧点火概率
+    'rotation_buckets': 72,       # 批量绘制时预旋转贴图的角度档数
+    'particles_per_ship': 2       # 每艘点火飞船每帧发射的粒子数
+}
+
 # 轨迹预测配置
 PREDICTION_CONFIG = {
     'steps': 100,
@@ -94,6 +140,34 @@ THRUSTER_CONFIG = {
     'particle_colors': [
         (255, 200, 100),  # 亮黄色
         (255, 150, 50)    # 橙色
+    ],
+    'particle_budget': 2000,          # 全局粒子预算（粒子池容量）
+    'particle_lifetime': (12, 28),    # 粒子寿命范围（帧）
+    'particle_speed': (1.5, 4.0),     # 喷射速度范围（像素/帧）
+    'particle_angle_spread': 0.35,    # 喷射角度扰动（弧度）
+    'particle_drag': 0.96,            # 每帧速度衰减
+    'particle_sprite_radius': 4,      # 辉光贴图半径（像素）
+    'particle_fade_levels': 8         # 寿命阶段数（每阶段一组预渲染贴图）
+}
+
+# 渲染质量自适应配置
+QUALITY_CONFIG = {
+    'enabled': True,           # 帧时间预算取自 GAME_CONFIG['fps']
+    'window': 30,              # 统计的帧数
+    'downgrade_ratio': 1.0,    # 平均帧耗时超过预算的该倍数时降级
+    'upgrade_ratio': 0.6,      # 平均帧耗时低于预算的该倍数时升级
+    'cooldown': 30,            # 切换后至少保持的帧数（升降级相同）
+    'max_backoff': 16,         # 升级前余量需持续 window 帧的最大倍数
+    # 从高到低的质量等级
+    'levels': [
+        {'name': 'high', 'trail_step': 1, 'prediction_steps': 100,
+         'particles': True, 'textures': True, 'twinkle_rate': 0.02},
+        {'name': 'medium', 'trail_step': 2, 'prediction_steps': 60,
+         'particles': True, 'textures': True, 'twinkle_rate': 0.01},
+        {'name': 'low', 'trail_step': 4, 'prediction_steps': 30,
+         'particles': False, 'textures': True, 'twinkle_rate': 0.005},
+        {'name': 'minimal', 'trail_step': 8, 'prediction_steps': 15,
+         'particles': False, 'textures': False, 'twinkle_rate': 0}
     ]
 }
 
@@ -105,12 +179,14 @@ SUCCESS_CONDITIONS = {
 
 # 背景配置
 RENDER_BACKGROUND = True  # 是否渲染星空背景
-STAR_COUNT = 200         # 星星数量
+STAR_COUNT = 200         # 每屏面积的星星数量（按世界面积等比增加）
 STAR_SIZE_RANGE = (1, 3) # 星星尺寸范围（像素）
 STAR_BRIGHTNESS_RANGE = (50, 255) # 亮度范围（0-255）
 BACKGROUND_SEED = 42     # 随机种子（固定此值可使星空不变）
 
 GAME_CONFIG = {
     'time_limit': 300,  # 时间限制（秒）
-    'warning_time': 60  # 剩余时间警告阈值（秒）
+    'warning_time': 60,  # 剩余时间警告阈值（秒）
+    'fps': 60,           # 帧率：主循环限帧、帧计数时钟和渲染质量预算共用
+    'tick_clock': False  # 是否按帧计数计时（False 则使用真实时间）
 }
\ No newline at end of file
@@ -1,19 +1,29 @@
 import math
 import pygame
-from environment.physics import PhysicsEngine
+import numpy as np
+from environment import kernels
+from utils.spatial import find_close_pairs
 from config import *
-import random
 
 class GameCore:
-    def __init__(self, env):
+    def __init__(self, env, tick_clock=None):
         self.env = env
         self.env.core = self  # 关键：将核心实例附加到环境对象
+        # 帧计数时钟：与真实时间解耦，便于快照和离线模拟
+        self.tick_clock = GAME_CONFIG['tick_clock'] if tick_clock is None else tick_clock
         self.reset()
         
     def get_elapsed_time(self):
         """获取已用时间（秒）"""
+        if self.tick_clock:
+            return self.env.tick / GAME_CONFIG['fps']
         return (pygame.time.get_ticks() - self.start_time) / 1000
 
+    def set_elapsed_time(self, elapsed):
+        """设置已用时间（秒），用于从快照恢复"""
+        if not self.tick_clock:
+            self.start_time = pygame.time.get_ticks() - elapsed * 1000
+
     
     def reset(self):
         """重置游戏状态"""
@@ -22,7 +32,7 @@ class GameCore:
         angle_rad = math.radians(SHIP_CONFIG['initial_angle'])
 
         self.env.ship.update({
-            'pos': [100, SCREEN_HEIGHT-100],
+            'pos': list(WORLD_CONFIG['ship_start']),
             'velocity': [
                 SHIP_CONFIG['initial_speed'] * math.cos(angle_rad),
                 -SHIP_CONFIG['initial_speed'] * math.sin(angle_rad)  # y轴向下
@@ -32,13 +42,20 @@ class GameCore:
         })
         
         # 随机化目标初始位置
-        self.env.target['angle'] = random.uniform(0, 2*math.pi)
+        self.env.target['angle'] = float(self.env.rng.uniform(0, 2*math.pi))
         self.env.update_target_position()
 
+        self.env.tick = 0
+        self.ship_hit = False  # 在 update_fleet 中与其他飞船相撞
         self.start_time = pygame.time.get_ticks()# 记录游戏开始时间
 
-    def update(self, actions):
-        """更新游戏状态"""
+    def advance(self):
+        """
+        推进一帧的世界状态（逻辑帧、目标、干扰行星）并检查时间限制
+        :return: 超时返回 'timeout'，否则返回 None
+        """
+        self.env.tick += 1
+
         # 更新目标位置
         self.env.update_target_position()
         self.env.update_disturber_position()
@@ -47,75 +64,102 @@ class GameCore:
         elapsed_time = self.get_elapsed_time()
         if elapsed_time > GAME_CONFIG['time_limit']:
             return 'timeout'
-        
-        # 计算推力
-        thrust_x, thrust_y = PhysicsEngine.apply_thrust(self.env.ship, actions)
-        
-        # 计算引力
-        gravity = PhysicsEngine.calculate_gravity(
-            self.env.ship['pos'],
-            self.env.star['pos'],
-            self.env.star['mass'],
-            GRAVITY_CONSTANT
-        )
-        
-        # 更新速度
-        self.env.ship['velocity'][0] += (thrust_x + gravity[0]) * TIME_STEP
-        self.env.ship['velocity'][1] += (thrust_y + gravity[1]) * TIME_STEP
-        
-        # 更新位置
-        self.env.ship['pos'][0] += self.env.ship['velocity'][0] * TIME_STEP
-        self.env.ship['pos'][1] += self.env.ship['velocity'][1] * TIME_STEP
+        return None
 
-        # 边界检测
-        ship = self.env.ship
-        if (ship['pos'][0] < 0 or ship['pos'][0] > SCREEN_WIDTH or
-            ship['pos'][1] < 0 or ship['pos'][1] > SCREEN_HEIGHT):
-            return 'out_of_bounds'
-        
-        # 碰撞检测
-        distance_to_star = math.hypot(
-            self.env.ship['pos'][0] - self.env.star['pos'][0],
-            self.env.ship['pos'][1] - self.env.star['pos'][1]
-        )
-        if distance_to_star < self.env.star['radius'] + self.env.ship['radius']:
-            return 'star_collision'
+    @staticmethod
+    def status_name(code, rel_speed):
+        """将物理内核的状态码转换为 update 返回的状态字符串"""
+        if code == kernels.STATUS_COLLISION:
+            return f'collision:{rel_speed}m/s'  # 速度过快视为碰撞
+        return kernels.STATUS_NAMES[code]
+
+    def update(self, actions):
+        """更新游戏状态"""
+        timeout = self.advance()
+        if timeout is not None:
+            return timeout
+
+        # 飞船间碰撞在 update_fleet 中与其他飞船一并判定
+        if self.ship_hit:
+            return 'ship_collision'
         
-        # 干扰行星碰撞检测
-        distance = math.hypot(
-            self.env.ship['pos'][0] - self.env.disturber['pos'][0],
-            self.env.ship['pos'][1] - self.env.disturber['pos'][1]
-        )
-        if distance < self.env.disturber['radius'] + self.env.ship['radius']:
-            return 'disturber_collision'
-
-        # 计算相对速度
-        target_vel = PhysicsEngine.calculate_orbital_velocity(
-            self.env.star['pos'],
-            self.env.target['orbit_radius'],
-            self.env.target['angular_speed']
-        )
-        rel_velocity = [
-            self.env.ship['velocity'][0] - target_vel[0],
-            self.env.ship['velocity'][1] - target_vel[1]
-        ]
-        rel_speed = math.hypot(*rel_velocity)
-            
-        # 目标达成检测
-        distance_to_target = math.hypot(
-            self.env.ship['pos'][0] - self.env.target['pos'][0],
-            self.env.ship['pos'][1] - self.env.target['pos'][1]
+        # 融合物理内核：推力、引力、积分、碰撞与着陆判定一次完成
+        ship = self.env.ship
+        ship['rotation'], status, rel_speed = kernels.step_ship(
+            ship['pos'], ship['velocity'], ship['rotation'], actions,
+            self.env.physics_params(),
+            self.env.body_pos, self.env.body_gm, self.env.body_radius,
+            field=self.env.field_arrays()
         )
-        if distance_to_target < self.env.target['radius']:
-            # 检查相对速度
-            if rel_speed > SUCCESS_CONDITIONS['max_speed']:
-                return f'collision:{rel_speed}m/s'  # 速度过快视为碰撞
-            
-            # 检查降落角度
-            angle_diff = abs(ship['rotation'] % 360 - 180)  # 理想角度是180度（底部向下）
-            if angle_diff > SUCCESS_CONDITIONS['max_angle_deviation']:
-                return 'bad_angle'
-            
-            return 'success'
-            
-        return 'playing'
\ No newline at end of file
+        return self.status_name(status, rel_speed)
+
+    def update_fleet(self, actions=None, advance_world=False):
+        """
+        批量更新共享世界中的所有飞船
+        :param actions: 形状 (N, 4) 的动作数组，None 表示使用自动驾驶
+        :param advance_world: 是否推进目标和干扰行星（未同时调用 update 时设为 True）
+        :return: 每艘飞船的状态码数组（已结束的飞船保留结束状态直到重生）
+        玩家飞船也参与飞船间碰撞判定，相撞时下一次 update 返回 'ship_collision'
+        """
+        fleet = self.env.fleet
+        if fleet.size == 0:
+            return fleet.status
+        if advance_world:
+            self.env.update_target_position()
+            self.env.update_disturber_position()
+        if actions is None:
+            actions = fleet.autopilot_actions(self.env.target['pos'])
+        else:
+            # 渲染按 fleet.actions 绘制推进器尾焰
+            fleet.actions[:] = actions
+            actions = fleet.actions
+
+        params = self.env.physics_params()
+        field = self.env.field_arrays()
+        active = fleet.active
+        if active.all():
+            kernels.step_ships(
+                fleet.pos, fleet.vel, fleet.rot, actions, params,
+                self.env.body_pos, self.env.body_gm, self.env.body_radius,
+                field=field, out_status=fleet.status, out_rel_speed=fleet.rel_speed
+            )
+            idx = np.arange(fleet.size)
+        else:
+            idx = np.flatnonzero(active)
+            pos, vel, rot = fleet.pos[idx], fleet.vel[idx], fleet.rot[idx]
+            status, rel_speed = kernels.step_ships(
+                pos, vel, rot, actions[idx], params,
+                self.env.body_pos, self.env.body_gm, self.env.body_radius,
+                field=field
+            )
+            fleet.pos[idx], fleet.vel[idx], fleet.rot[idx] = pos, vel, rot
+            fleet.status[idx] = status
+            fleet.rel_speed[idx] = rel_speed
+
+        # 各飞船独立计时
+        fleet.age[idx] += 1
+        status = fleet.status[idx]
+        time_limit = GAME_CONFIG['time_limit'] * GAME_CONFIG['fps']
+        status[(status == kernels.STATUS_PLAYING) & (fleet.age[idx] > time_limit)] = kernels.STATUS_TIMEOUT
+
+        # 飞船间碰撞（玩家飞船作为最后一行参与）：空间哈希只检查相邻网格
+        playing = idx[status == kernels.STATUS_PLAYING]
+        player = len(playing)
+        positions = np.concatenate([fleet.pos[playing], [self.env.ship['pos']]])
+        i, j = find_close_pairs(positions, 2 * SHIP_CONFIG['radius'])
+        hit = np.concatenate([i, j])
+        if (hit == player).any():
+            self.ship_hit = True  # 下一次 update 返回 'ship_collision'
+        fleet.status[idx] = status
+        fleet.status[playing[hit[hit < player]]] = kernels.STATUS_SHIP_COLLISION
+
+        # 结束的飞船开始重生倒计时；倒计时结束的飞船重生
+        waiting = np.flatnonzero(~active)
+        fleet.respawn[waiting] -= 1
+        ended = idx[fleet.status[idx] != kernels.STATUS_PLAYING]
+        if len(ended):
+            fleet.finish(ended)
+        ready = waiting[fleet.respawn[waiting] == 0]
+        if len(ready):
+            fleet.spawn(ready, self.env.bodies, avoid=[self.env.ship['pos']])
+        return fleet.status
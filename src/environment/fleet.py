@@ -0,0 +1,197 @@
+import math
+import numpy as np
+from config import *
+from environment import kernels
+from utils.spatial import find_close_pairs
+from utils.helpers import RNG_STATE_WORDS, pack_rng_state, unpack_rng_state
+
+# 快照中每艘飞船占用的 float64 个数：pos(2) vel(2) rot status age respawn
+SNAPSHOT_WORDS_PER_SHIP = 8
+
+# 候选点数 x 已占用位置数不超过该值时直接两两比较，否则用空间哈希
+SPAWN_DIRECT_CHECK_LIMIT = 100000
+
+# 每次 spawn 调用的最大抽样轮数，放不下的飞船保持离场，下一帧再试
+SPAWN_MAX_ATTEMPTS = 8
+
+# 出生点（间距 spawn_margin 的圆盘）允许占据的可用面积比例：
+# 随机顺序放置的极限约为 0.547，越接近越难在有限轮数内放下，留出充足余量
+SPAWN_MAX_FILL = 0.3
+
+
+class Fleet:
+    """
+    共享世界中的多艘飞船（结构化数组存储，便于批量物理和渲染）
+    每艘飞船有独立的状态、存活时长和重生倒计时；
+    respawn 为 0 表示在场，大于 0 表示已结束、正在等待重生
+    """
+
+    def __init__(self, size, seed=None):
+        """
+        :param size: 飞船数量
+        :param seed: 随机种子（出生点和自动驾驶）
+        """
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+
+        self.pos = np.zeros((size, 2), dtype=np.float64)
+        self.vel = np.zeros((size, 2), dtype=np.float64)
+        self.rot = np.zeros(size, dtype=np.float64)
+        self.actions = np.zeros((size, 4), dtype=np.bool_)
+        self.status = np.zeros(size, dtype=np.int8)
+        self.rel_speed = np.zeros(size, dtype=np.float64)
+        self.age = np.zeros(size, dtype=np.int32)      # 本次出生后经过的帧数
+        self.respawn = np.zeros(size, dtype=np.int32)  # 重生倒计时（帧）
+
+        # 各结束状态的累计次数，下标为状态码
+        self.outcomes = np.zeros(max(kernels.STATUS_NAMES) + 1, dtype=np.int64)
+
+    @property
+    def active(self):
+        """在场飞船掩码"""
+        return self.respawn == 0
+
+    @property
+    def state_size(self):
+        """快照中飞船群状态占用的 float64 个数（没有飞船时为 0）"""
+        if self.size == 0:
+            return 0
+        return self.size * SNAPSHOT_WORDS_PER_SHIP + len(self.outcomes) + RNG_STATE_WORDS
+
+    def snapshot(self, out):
+        """
+        将飞船群的可变状态写入缓冲区
+        :param out: 长度为 state_size 的 float64 数组（视图）
+        """
+        if self.size == 0:
+            return
+        n = self.size
+        ships = out[:n * SNAPSHOT_WORDS_PER_SHIP].reshape(SNAPSHOT_WORDS_PER_SHIP, n)
+        ships[0:2] = self.pos.T
+        ships[2:4] = self.vel.T
+        ships[4] = self.rot
+        ships[5] = self.status
+        ships[6] = self.age
+        ships[7] = self.respawn
+        offset = n * SNAPSHOT_WORDS_PER_SHIP
+        out[offset:offset + len(self.outcomes)] = self.outcomes
+        pack_rng_state(self.rng, out[offset + len(self.outcomes):self.state_size])
+
+    def restore(self, state):
+        """
+        从缓冲区恢复飞船群状态
+        :param state: snapshot 写入的 state_size 个数
+        """
+        if self.size == 0:
+            return
+        n = self.size
+        ships = state[:n * SNAPSHOT_WORDS_PER_SHIP].reshape(SNAPSHOT_WORDS_PER_SHIP, n)
+        self.pos[:] = ships[0:2].T
+        self.vel[:] = ships[2:4].T
+        self.rot[:] = ships[4]
+        self.status[:] = ships[5]
+        self.age[:] = ships[6]
+        self.respawn[:] = ships[7]
+        offset = n * SNAPSHOT_WORDS_PER_SHIP
+        self.outcomes[:] = state[offset:offset + len(self.outcomes)]
+        unpack_rng_state(self.rng, state[offset + len(self.outcomes):self.state_size])
+
+    def check_capacity(self, bodies, reserved=1):
+        """
+        检查飞船数量能否在世界中放下，否则抛出 ValueError
+        :param bodies: 恒星列表
+        :param reserved: 额外需要避开的位置数（如玩家飞船）
+        """
+        margin = FLEET_CONFIG['spawn_margin']
+        area = (max(WORLD_CONFIG['width'] - 2 * margin, 0) *
+                max(WORLD_CONFIG['height'] - 2 * margin, 0))
+        area -= sum(math.pi * (body['radius'] + margin) ** 2 for body in bodies)
+        capacity = int(max(area, 0) * SPAWN_MAX_FILL / (math.pi * (margin / 2) ** 2)) - reserved
+        if self.size > capacity:
+            raise ValueError(
+                f"飞船数量 {self.size} 超出世界可容纳的上限 {max(capacity, 0)}"
+                f"（{WORLD_CONFIG['width']}x{WORLD_CONFIG['height']}，spawn_margin={margin}），"
+                f"请减小 FLEET_CONFIG['count'] / spawn_margin 或增大世界尺寸"
+            )
+
+    def spawn(self, indices, bodies, avoid=None):
+        """
+        在世界中随机位置重生飞船（避开恒星和其他在场飞船）
+        最多抽样 SPAWN_MAX_ATTEMPTS 轮，仍未放下的飞船保持离场（respawn = 1），下一帧重试
+        :param indices: 飞船编号数组
+        :param bodies: 恒星列表
+        :param avoid: 可选的其他需避开的位置（如玩家飞船），形状 (K, 2)
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        margin = FLEET_CONFIG['spawn_margin']
+        # 已占用的位置：不在本批重生中的在场飞船 + 调用方指定的位置
+        placing = np.zeros(self.size, dtype=bool)
+        placing[indices] = True
+        occupied = self.pos[self.active & ~placing]
+        if avoid is not None:
+            occupied = np.concatenate([occupied, np.asarray(avoid, dtype=np.float64).reshape(-1, 2)])
+        pending = indices
+        for _ in range(SPAWN_MAX_ATTEMPTS):
+            if not len(pending):
+                break
+            pos = self.rng.uniform(
+                (margin, margin),
+                (WORLD_CONFIG['width'] - margin, WORLD_CONFIG['height'] - margin),
+                size=(len(pending), 2)
+            )
+            ok = np.ones(len(pending), dtype=bool)
+            for body in bodies:
+                d = pos - body['pos']
+                ok &= (d * d).sum(axis=1) > (body['radius'] + margin) ** 2
+            # 与已占用位置及本批其他候选点保持距离，否则重生后立即相撞
+            m = len(occupied)
+            if len(pos) * m <= SPAWN_DIRECT_CHECK_LIMIT:
+                # 少量重生（常见情况）直接计算到所有已占用位置的距离
+                d = pos[:, None, :] - occupied[None, :, :]
+                ok &= ((d * d).sum(axis=2) > margin * margin).all(axis=1)
+                i, j = find_close_pairs(pos, margin)
+                ok[i] = ok[j] = False
+            else:
+                i, j = find_close_pairs(np.concatenate([occupied, pos]), margin)
+                close = np.concatenate([i, j])
+                ok[close[close >= m] - m] = False
+            self.pos[pending[ok]] = pos[ok]
+            occupied = np.concatenate([occupied, pos[ok]])
+            pending = pending[~ok]
+
+        if len(pending):
+            self.respawn[pending] = 1
+            placing[pending] = False
+            indices = np.flatnonzero(placing)
+        heading = self.rng.uniform(0, 2 * math.pi, len(indices))
+        speed = SHIP_CONFIG['initial_speed']
+        self.vel[indices, 0] = speed * np.cos(heading)
+        self.vel[indices, 1] = -speed * np.sin(heading)  # y轴向下
+        self.rot[indices] = np.degrees(heading)
+        self.status[indices] = kernels.STATUS_PLAYING
+        self.age[indices] = 0
+        self.respawn[indices] = 0
+
+    def finish(self, indices):
+        """记录结束状态并开始重生倒计时"""
+        self.outcomes += np.bincount(self.status[indices], minlength=len(self.outcomes))
+        self.respawn[indices] = max(FLEET_CONFIG['respawn_delay'], 1)
+
+    def autopilot_actions(self, target_pos):
+        """
+        简单的自动驾驶：转向目标并在大致对准时随机点火
+        :return: 形状 (size, 4) 的动作数组
+        """
+        dx = target_pos[0] - self.pos[:, 0]
+        dy = target_pos[1] - self.pos[:, 1]
+        desired = np.degrees(np.arctan2(-dy, dx))  # y轴向下
+        diff = (desired - self.rot + 180) % 360 - 180
+
+        tolerance = SHIP_CONFIG['rotation_speed']
+        actions = self.actions
+        actions[:, 0] = diff > tolerance
+        actions[:, 1] = diff < -tolerance
+        actions[:, 2] = ((np.abs(diff) < 30) &
+                         (self.rng.random(self.size) < FLEET_CONFIG['autopilot_thrust_prob']))
+        actions[:, 3] = False
+        return actions
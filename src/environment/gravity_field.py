@@ -0,0 +1,210 @@
+import math
+import time
+import numpy as np
+from config import *
+from environment import kernels
+
+
+# 已构建的引力场（静态天体相同的环境之间共享）
+_FIELD_CACHE = {}
+
+
+class GravityField:
+    """
+    静态天体的引力加速度场缓存
+    在规则网格上预先计算加速度，查询时做双线性插值；
+    靠近软化半径（引力截断处）时梯度很大，改用精确公式
+    """
+
+    def __init__(self, bodies, width, height, cell_size, exact_radius, G=GRAVITY_CONSTANT):
+        """
+        :param bodies: 静态天体列表，每项包含 'pos' 和 'mass'
+        :param width: 场覆盖宽度
+        :param height: 场覆盖高度
+        :param cell_size: 网格间距（像素）
+        :param exact_radius: 距天体中心小于该距离时使用精确计算
+        :param G: 引力常数
+        """
+        self.bodies = [(float(b['pos'][0]), float(b['pos'][1]), float(b['mass'])) for b in bodies]
+        self.width = width
+        self.height = height
+        self.cell_size = float(cell_size)
+        self.exact_radius = float(exact_radius)
+        self.G = G
+
+        # 与物理内核相同的天体数组和参数（插值和精确计算都调用内核实现）
+        self.body_pos = np.array([[bx, by] for bx, by, _ in self.bodies], dtype=np.float64).reshape(-1, 2)
+        self.body_gm = np.array([G * mass for _, _, mass in self.bodies], dtype=np.float64)
+        self.exact_params = kernels.make_params()
+        self.params = kernels.make_params()
+        self.params[kernels.P_USE_FIELD] = 1
+        self.params[kernels.P_FIELD_CELL] = self.cell_size
+        self.params[kernels.P_FIELD_EXACT_RADIUS] = self.exact_radius
+
+        # 网格节点数（包含右/下边界节点）
+        self.nx = int(math.ceil(width / self.cell_size)) + 1
+        self.ny = int(math.ceil(height / self.cell_size)) + 1
+        xs = np.arange(self.nx) * self.cell_size
+        ys = np.arange(self.ny) * self.cell_size
+        gx, gy = np.meshgrid(xs, ys)
+        grid_pos = np.stack([gx.ravel(), gy.ravel()], axis=1)
+
+        acc = self.exact_batch(grid_pos)
+        # ax/ay 形状为 (ny, nx)，按 [行=y, 列=x] 索引
+        self.ax = acc[:, 0].reshape(self.ny, self.nx)
+        self.ay = acc[:, 1].reshape(self.ny, self.nx)
+
+        self._heatmap = None
+
+    @classmethod
+    def from_env(cls, env):
+        """根据环境中的静态天体（所有恒星）构建覆盖整个世界的引力场，相同配置的环境共享同一实例"""
+        key = (
+            tuple((tuple(b['pos']), b['mass']) for b in env.bodies),
+            WORLD_CONFIG['width'], WORLD_CONFIG['height'],
+            GRAVITY_FIELD_CONFIG['cell_size'],
+            GRAVITY_FIELD_CONFIG['exact_radius']
+        )
+        if key not in _FIELD_CACHE:
+            _FIELD_CACHE[key] = cls(
+                env.bodies,
+                WORLD_CONFIG['width'], WORLD_CONFIG['height'],
+                GRAVITY_FIELD_CONFIG['cell_size'],
+                GRAVITY_FIELD_CONFIG['exact_radius']
+            )
+        return _FIELD_CACHE[key]
+
+    @property
+    def arrays(self):
+        """物理内核使用的网格 (ax, ay)"""
+        return self.ax, self.ay
+
+    def exact_batch(self, positions):
+        """
+        精确计算一批位置的引力加速度
+        :param positions: 形状 (N, 2) 的位置数组
+        :return: 形状 (N, 2) 的加速度数组
+        """
+        return kernels.gravity_batch(positions, self.exact_params, self.body_pos, self.body_gm)
+
+    def _near_body_mask(self, positions):
+        """返回位于精确计算区域内的位置掩码"""
+        mask = np.zeros(len(positions), dtype=bool)
+        r2 = self.exact_radius ** 2
+        for bx, by, _ in self.bodies:
+            dx = positions[:, 0] - bx
+            dy = positions[:, 1] - by
+            mask |= dx * dx + dy * dy < r2
+        return mask
+
+    def lookup_batch(self, positions):
+        """
+        批量查询加速度（双线性插值，靠近天体或超出网格时精确计算）
+        :param positions: 形状 (N, 2) 的位置数组
+        :return: 形状 (N, 2) 的加速度数组
+        """
+        return kernels.gravity_batch(positions, self.params, self.body_pos, self.body_gm,
+                                     field=self.arrays)
+
+    def lookup(self, pos):
+        """查询单个位置的加速度，返回 [ax, ay]"""
+        ax, ay = kernels.gravity_at(float(pos[0]), float(pos[1]), self.params,
+                                    self.body_pos, self.body_gm, field=self.arrays)
+        return [ax, ay]
+
+    def report(self, samples=20000, ships=1000, steps=100, repeats=20, seed=0):
+        """
+        生成精度与速度报告
+        耗时取自模拟实际使用的路径（当前后端的 step_ships 与 predict_paths），
+        分别在启用和不启用引力场时测量；speedup 小于 1 表示缓存反而更慢
+        :param samples: 精度统计的随机采样点数
+        :param ships: step_ships 计时使用的飞船数
+        :param steps: predict_paths 计时的预测步数
+        :param repeats: 计时重复次数（取最小值）
+        :param seed: 随机种子
+        :return: 包含误差与耗时统计的字典
+        """
+        rng = np.random.default_rng(seed)
+        positions = rng.uniform((0, 0), (self.width, self.height), size=(samples, 2))
+        exact = self.exact_batch(positions)
+        cached = self.lookup_batch(positions)
+        err = np.hypot(*(cached - exact).T)
+        mag = np.maximum(np.hypot(*exact.T), 1e-12)
+        rel = err / mag
+
+        # 计时用参数：只受引力作用，不设目标和干扰行星
+        base = kernels.make_params()
+        base[kernels.P_DT] = TIME_STEP
+        base[kernels.P_MAX_X] = self.width
+        base[kernels.P_MAX_Y] = self.height
+        base[kernels.P_DISTURBER_X] = base[kernels.P_TARGET_X] = -1e9
+        base[kernels.P_MAX_SPEED] = np.inf
+        body_radius = np.zeros(len(self.bodies))
+        pos0 = rng.uniform((0, 0), (self.width, self.height), size=(ships, 2))
+        vel0 = rng.normal(0, 2, size=(ships, 2))
+        rot0 = np.zeros(ships)
+        actions = np.zeros((ships, 4), dtype=np.bool_)
+
+        timings = {}
+        for name, params, field in (('exact', base, None), ('field', base.copy(), self.arrays)):
+            if field is not None:
+                params[kernels.P_USE_FIELD] = 1
+                params[kernels.P_FIELD_CELL] = self.cell_size
+                params[kernels.P_FIELD_EXACT_RADIUS] = self.exact_radius
+            step_time = predict_time = np.inf
+            for _ in range(repeats + 1):  # 首次调用用于预热
+                pos, vel, rot = pos0.copy(), vel0.copy(), rot0.copy()
+                t0 = time.perf_counter()
+                kernels.step_ships(pos, vel, rot, actions, params,
+                                   self.body_pos, self.body_gm, body_radius, field=field)
+                step_time = min(step_time, time.perf_counter() - t0)
+                t0 = time.perf_counter()
+                kernels.predict_paths(pos0[:1], vel0[:1], steps, params,
+                                      self.body_pos, self.body_gm, field=field)
+                predict_time = min(predict_time, time.perf_counter() - t0)
+            timings[name] = (step_time, predict_time)
+
+        return {
+            'backend': kernels.BACKEND,
+            'samples': samples,
+            'grid_shape': (self.ny, self.nx),
+            'exact_fraction': float(self._near_body_mask(positions).mean()),
+            'max_abs_error': float(err.max()),
+            'mean_rel_error': float(rel.mean()),
+            'max_rel_error': float(rel.max()),
+            'step_exact_us': timings['exact'][0] * 1e6,
+            'step_field_us': timings['field'][0] * 1e6,
+            'step_speedup': timings['exact'][0] / max(timings['field'][0], 1e-12),
+            'predict_exact_us': timings['exact'][1] * 1e6,
+            'predict_field_us': timings['field'][1] * 1e6,
+            'predict_speedup': timings['exact'][1] / max(timings['field'][1], 1e-12)
+        }
+
+    def heatmap_surface(self, alpha=None):
+        """
+        生成（并缓存）引力势阱热力图，用于渲染叠加层
+        每个像素对应一个网格节点，绘制时按摄像机视口裁剪并缩放
+        :param alpha: 叠加层透明度（0-255）
+        :return: pygame.Surface，尺寸为 (nx, ny)
+        """
+        if self._heatmap is not None:
+            return self._heatmap
+        import pygame
+
+        if alpha is None:
+            alpha = GRAVITY_FIELD_CONFIG['overlay_alpha']
+        # 对加速度大小取对数，压缩动态范围
+        mag = np.log1p(np.hypot(self.ax, self.ay))
+        norm = (mag - mag.min()) / max(mag.max() - mag.min(), 1e-12)
+
+        # 冷色（弱引力）到暖色（强引力）
+        rgb = np.empty((self.nx, self.ny, 3), dtype=np.uint8)
+        t = norm.T
+        rgb[..., 0] = (255 * t).astype(np.uint8)
+        rgb[..., 1] = (80 * (1 - np.abs(2 * t - 1))).astype(np.uint8)
+        rgb[..., 2] = (255 * (1 - t)).astype(np.uint8)
+
+        surface = pygame.surfarray.make_surface(rgb).convert()
+        surface.set_alpha(alpha)
+        self._heatmap = surface
+        return surface
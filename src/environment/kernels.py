@@ -0,0 +1,544 @@
+"""
+融合物理内核：一次完成推力、引力、积分、碰撞与着陆判定
+安装了 Numba 时自动使用 JIT 编译版本，否则退回结果一致的 NumPy 实现
+
+所有内核都按飞船数组批量处理：
+    pos/vel: 形状 (N, 2)    rot: 形状 (N,)    actions: 形状 (N, 4)
+天体（参与引力与碰撞的恒星）：
+    body_pos: (M, 2)    body_gm: (M,) 即 G*质量    body_radius: (M,)
+其余标量参数打包在 params 数组中，下标见 P_* 常量；
+step_ships 也接受形状 (N, N_PARAMS) 的逐飞船参数（例如各自目标位置不同的多个对局），
+此时引力场相关参数（P_USE_FIELD 等）取第一行，所有行须一致
+"""
+import math
+import numpy as np
+from config import *
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# 状态码（与 server.protocol.STATUS_CODES 的编码一致）
+STATUS_PLAYING = 0
+STATUS_SUCCESS = 1
+STATUS_TIMEOUT = 2  # 由 GameCore 判定
+STATUS_OUT_OF_BOUNDS = 3
+STATUS_STAR_COLLISION = 4
+STATUS_DISTURBER_COLLISION = 5
+STATUS_COLLISION = 6
+STATUS_BAD_ANGLE = 7
+STATUS_SHIP_COLLISION = 8  # 飞船之间相撞（由 GameCore.update_fleet 判定）
+
+STATUS_NAMES = {
+    STATUS_PLAYING: 'playing',
+    STATUS_SUCCESS: 'success',
+    STATUS_TIMEOUT: 'timeout',
+    STATUS_OUT_OF_BOUNDS: 'out_of_bounds',
+    STATUS_STAR_COLLISION: 'star_collision',
+    STATUS_DISTURBER_COLLISION: 'disturber_collision',
+    STATUS_COLLISION: 'collision',
+    STATUS_BAD_ANGLE: 'bad_angle',
+    STATUS_SHIP_COLLISION: 'ship_collision'
+}
+
+# params 数组下标
+P_DT = 0
+P_THRUST = 1
+P_ROTATION_SPEED = 2
+P_SHIP_RADIUS = 3
+P_MIN_X = 4
+P_MIN_Y = 5
+P_MAX_X = 6
+P_MAX_Y = 7
+P_DISTURBER_X = 8
+P_DISTURBER_Y = 9
+P_DISTURBER_RADIUS = 10
+P_TARGET_X = 11
+P_TARGET_Y = 12
+P_TARGET_RADIUS = 13
+P_TARGET_VX = 14
+P_TARGET_VY = 15
+P_MAX_SPEED = 16
+P_MAX_ANGLE = 17
+P_USE_FIELD = 18
+P_FIELD_CELL = 19
+P_FIELD_EXACT_RADIUS = 20
+N_PARAMS = 21
+
+MIN_GRAVITY_DISTANCE = 10.0  # 引力软化距离，与 PhysicsEngine.calculate_gravity 一致
+
+
+def make_params():
+    """创建空参数数组"""
+    return np.zeros(N_PARAMS, dtype=np.float64)
+
+
+# ---------------------------------------------------------------------------
+# 逐飞船标量实现（由 Numba 编译）
+# ---------------------------------------------------------------------------
+
+# 除引力场网格外只使用 a[i][j] 形式的下标和 len()：Numba 编译时作用于数组，
+# 纯 Python 执行时作用于 tolist() 得到的列表（逐元素访问列表比访问 NumPy 数组快得多）
+
+def _gravity_scalar(x, y, body_pos, body_gm, field_ax, field_ay, params):
+    """计算单点引力加速度（精确或插值）"""
+    use_field = params[P_USE_FIELD] > 0
+    if use_field:
+        exact_r2 = params[P_FIELD_EXACT_RADIUS] * params[P_FIELD_EXACT_RADIUS]
+        for j in range(len(body_pos)):
+            body = body_pos[j]
+            dx = x - body[0]
+            dy = y - body[1]
+            if dx * dx + dy * dy < exact_r2:
+                use_field = False
+                break
+    if use_field:
+        fx = x / params[P_FIELD_CELL]
+        fy = y / params[P_FIELD_CELL]
+        ny, nx = field_ax.shape
+        if fx >= 0 and fy >= 0 and fx < nx - 1 and fy < ny - 1:
+            ix = int(fx)
+            iy = int(fy)
+            tx = fx - ix
+            ty = fy - iy
+            w00 = (1 - tx) * (1 - ty)
+            w10 = tx * (1 - ty)
+            w01 = (1 - tx) * ty
+            w11 = tx * ty
+            ax = (field_ax[iy, ix] * w00 + field_ax[iy, ix + 1] * w10 +
+                  field_ax[iy + 1, ix] * w01 + field_ax[iy + 1, ix + 1] * w11)
+            ay = (field_ay[iy, ix] * w00 + field_ay[iy, ix + 1] * w10 +
+                  field_ay[iy + 1, ix] * w01 + field_ay[iy + 1, ix + 1] * w11)
+            return ax, ay
+
+    ax = 0.0
+    ay = 0.0
+    for j in range(len(body_pos)):
+        body = body_pos[j]
+        dx = body[0] - x
+        dy = body[1] - y
+        dist = math.sqrt(dx * dx + dy * dy)
+        r = max(dist, MIN_GRAVITY_DISTANCE)
+        F = body_gm[j] / (r * r)
+        if dist > 0:
+            ax += F * (dx / dist)
+            ay += F * (dy / dist)
+        else:
+            ax += F
+    return ax, ay
+
+
+def _step_ships_loop(pos, vel, rot, actions, params, body_pos, body_gm, body_radius,
+                     field_ax, field_ay, out_status, out_rel_speed):
+    shared = len(params) == 1
+    for i in range(len(pos)):
+        p = params[0] if shared else params[i]
+        action = actions[i]
+        ship_pos = pos[i]
+        ship_vel = vel[i]
+        dt = p[P_DT]
+        thrust = p[P_THRUST]
+        ship_r = p[P_SHIP_RADIUS]
+        # 推力方向使用旋转前的角度（与 PhysicsEngine.apply_thrust 一致）
+        rotation = rot[i]
+        angle_rad = math.radians(rotation)
+        thrust_x = 0.0
+        thrust_y = 0.0
+        if action[0]:
+            rotation += p[P_ROTATION_SPEED]
+        if action[1]:
+            rotation -= p[P_ROTATION_SPEED]
+        if action[2]:
+            thrust_x += thrust * math.cos(angle_rad)
+            thrust_y -= thrust * math.sin(angle_rad)
+        if action[3]:
+            thrust_x -= thrust * math.cos(angle_rad)
+            thrust_y += thrust * math.sin(angle_rad)
+        rot[i] = rotation
+
+        x = ship_pos[0]
+        y = ship_pos[1]
+        gx, gy = _gravity_scalar(x, y, body_pos, body_gm, field_ax, field_ay, p)
+        vx = ship_vel[0] + (thrust_x + gx) * dt
+        vy = ship_vel[1] + (thrust_y + gy) * dt
+        x += vx * dt
+        y += vy * dt
+        ship_vel[0] = vx
+        ship_vel[1] = vy
+        ship_pos[0] = x
+        ship_pos[1] = y
+
+        rvx = vx - p[P_TARGET_VX]
+        rvy = vy - p[P_TARGET_VY]
+        rel_speed = math.sqrt(rvx * rvx + rvy * rvy)
+        out_rel_speed[i] = rel_speed
+
+        if x < p[P_MIN_X] or x > p[P_MAX_X] or y < p[P_MIN_Y] or y > p[P_MAX_Y]:
+            out_status[i] = STATUS_OUT_OF_BOUNDS
+            continue
+
+        status = STATUS_PLAYING
+        for j in range(len(body_pos)):
+            body = body_pos[j]
+            dx = x - body[0]
+            dy = y - body[1]
+            if math.sqrt(dx * dx + dy * dy) < body_radius[j] + ship_r:
+                status = STATUS_STAR_COLLISION
+                break
+        if status == STATUS_PLAYING:
+            dx = x - p[P_DISTURBER_X]
+            dy = y - p[P_DISTURBER_Y]
+            if math.sqrt(dx * dx + dy * dy) < p[P_DISTURBER_RADIUS] + ship_r:
+                status = STATUS_DISTURBER_COLLISION
+        if status == STATUS_PLAYING:
+            dx = x - p[P_TARGET_X]
+            dy = y - p[P_TARGET_Y]
+            if math.sqrt(dx * dx + dy * dy) < p[P_TARGET_RADIUS]:
+                if rel_speed > p[P_MAX_SPEED]:
+                    status = STATUS_COLLISION
+                elif abs(rotation % 360 - 180) > p[P_MAX_ANGLE]:
+                    status = STATUS_BAD_ANGLE
+                else:
+                    status = STATUS_SUCCESS
+        out_status[i] = status
+
+
+def _predict_paths_loop(pos, vel, steps, params, body_pos, body_gm,
+                        field_ax, field_ay, out):
+    """out 形状为 (N, steps * 2)，每行依次存放 x0, y0, x1, y1, ..."""
+    dt = params[P_DT]
+    for i in range(len(pos)):
+        x = pos[i][0]
+        y = pos[i][1]
+        vx = vel[i][0]
+        vy = vel[i][1]
+        row = out[i]
+        for k in range(steps):
+            gx, gy = _gravity_scalar(x, y, body_pos, body_gm, field_ax, field_ay, params)
+            vx += gx * dt
+            vy += gy * dt
+            x += vx * dt
+            y += vy * dt
+            row[2 * k] = x
+            row[2 * k + 1] = y
+
+
+# ---------------------------------------------------------------------------
+# NumPy 向量化实现（运算顺序与标量实现一致，结果逐位相同）
+# ---------------------------------------------------------------------------
+
+def _gravity_numpy(x, y, body_pos, body_gm, field_ax, field_ay, params):
+    ax = np.zeros_like(x)
+    ay = np.zeros_like(x)
+    exact = np.ones(x.shape, dtype=bool)
+
+    if params[P_USE_FIELD] > 0:
+        exact_r2 = params[P_FIELD_EXACT_RADIUS] * params[P_FIELD_EXACT_RADIUS]
+        near = np.zeros(x.shape, dtype=bool)
+        for j in range(body_pos.shape[0]):
+            dx = x - body_pos[j, 0]
+            dy = y - body_pos[j, 1]
+            near |= dx * dx + dy * dy < exact_r2
+        fx = x / params[P_FIELD_CELL]
+        fy = y / params[P_FIELD_CELL]
+        ny, nx = field_ax.shape
+        inside = ~near & (fx >= 0) & (fy >= 0) & (fx < nx - 1) & (fy < ny - 1)
+        if inside.any():
+            fx = fx[inside]
+            fy = fy[inside]
+            ix = fx.astype(np.intp)
+            iy = fy.astype(np.intp)
+            tx = fx - ix
+            ty = fy - iy
+            w00 = (1 - tx) * (1 - ty)
+            w10 = tx * (1 - ty)
+            w01 = (1 - tx) * ty
+            w11 = tx * ty
+            ax[inside] = (field_ax[iy, ix] * w00 + field_ax[iy, ix + 1] * w10 +
+                          field_ax[iy + 1, ix] * w01 + field_ax[iy + 1, ix + 1] * w11)
+            ay[inside] = (field_ay[iy, ix] * w00 + field_ay[iy, ix + 1] * w10 +
+                          field_ay[iy + 1, ix] * w01 + field_ay[iy + 1, ix + 1] * w11)
+        exact = ~inside
+
+    if exact.all():
+        xe, ye = x, y
+    else:
+        xe, ye = x[exact], y[exact]
+    gx = np.zeros_like(xe)
+    gy = np.zeros_like(xe)
+    for j in range(body_pos.shape[0]):
+        dx = body_pos[j, 0] - xe
+        dy = body_pos[j, 1] - ye
+        dist = np.sqrt(dx * dx + dy * dy)
+        r = np.maximum(dist, MIN_GRAVITY_DISTANCE)
+        F = body_gm[j] / (r * r)
+        safe = np.where(dist > 0, dist, 1.0)
+        gx += np.where(dist > 0, F * (dx / safe), F)
+        gy += np.where(dist > 0, F * (dy / safe), 0.0)
+    ax[exact] = gx
+    ay[exact] = gy
+    return ax, ay
+
+
+def _step_ships_numpy(pos, vel, rot, actions, params, body_pos, body_gm, body_radius,
+                      field_ax, field_ay, out_status, out_rel_speed):
+    # 逐列取参数：形状 (1,) 或 (N,)，与飞船数组广播
+    p = params.T
+    dt = p[P_DT]
+    thrust = p[P_THRUST]
+    ship_r = p[P_SHIP_RADIUS]
+    actions = actions.astype(bool, copy=False)
+
+    angle_rad = np.radians(rot)
+    rot += np.where(actions[:, 0], p[P_ROTATION_SPEED], 0.0)
+    rot -= np.where(actions[:, 1], p[P_ROTATION_SPEED], 0.0)
+    cos_t = thrust * np.cos(angle_rad)
+    sin_t = thrust * np.sin(angle_rad)
+    thrust_x = np.zeros_like(rot)
+    thrust_y = np.zeros_like(rot)
+    thrust_x += np.where(actions[:, 2], cos_t, 0.0)
+    thrust_y -= np.where(actions[:, 2], sin_t, 0.0)
+    thrust_x -= np.where(actions[:, 3], cos_t, 0.0)
+    thrust_y += np.where(actions[:, 3], sin_t, 0.0)
+
+    gx, gy = _gravity_numpy(pos[:, 0], pos[:, 1], body_pos, body_gm, field_ax, field_ay, params[0])
+    vel[:, 0] += (thrust_x + gx) * dt
+    vel[:, 1] += (thrust_y + gy) * dt
+    pos[:, 0] += vel[:, 0] * dt
+    pos[:, 1] += vel[:, 1] * dt
+    x = pos[:, 0]
+    y = pos[:, 1]
+
+    rvx = vel[:, 0] - p[P_TARGET_VX]
+    rvy = vel[:, 1] - p[P_TARGET_VY]
+    out_rel_speed[:] = np.sqrt(rvx * rvx + rvy * rvy)
+
+    # 按优先级从低到高依次覆盖
+    status = np.full(len(x), STATUS_PLAYING, dtype=out_status.dtype)
+    dx = x - p[P_TARGET_X]
+    dy = y - p[P_TARGET_Y]
+    landed = np.sqrt(dx * dx + dy * dy) < p[P_TARGET_RADIUS]
+    status[landed] = STATUS_SUCCESS
+    status[landed & (np.abs(rot % 360 - 180) > p[P_MAX_ANGLE])] = STATUS_BAD_ANGLE
+    status[landed & (out_rel_speed > p[P_MAX_SPEED])] = STATUS_COLLISION
+
+    dx = x - p[P_DISTURBER_X]
+    dy = y - p[P_DISTURBER_Y]
+    status[np.sqrt(dx * dx + dy * dy) < p[P_DISTURBER_RADIUS] + ship_r] = STATUS_DISTURBER_COLLISION
+    for j in range(body_pos.shape[0] - 1, -1, -1):
+        dx = x - body_pos[j, 0]
+        dy = y - body_pos[j, 1]
+        status[np.sqrt(dx * dx + dy * dy) < body_radius[j] + ship_r] = STATUS_STAR_COLLISION
+
+    outside = ((x < p[P_MIN_X]) | (x > p[P_MAX_X]) |
+               (y < p[P_MIN_Y]) | (y > p[P_MAX_Y]))
+    status[outside] = STATUS_OUT_OF_BOUNDS
+    out_status[:] = status
+
+
+def _predict_paths_numpy(pos, vel, steps, params, body_pos, body_gm,
+                         field_ax, field_ay, out):
+    dt = params[P_DT]
+    x = pos[:, 0].copy()
+    y = pos[:, 1].copy()
+    vx = vel[:, 0].copy()
+    vy = vel[:, 1].copy()
+    for k in range(steps):
+        gx, gy = _gravity_numpy(x, y, body_pos, body_gm, field_ax, field_ay, params)
+        vx += gx * dt
+        vy += gy * dt
+        x += vx * dt
+        y += vy * dt
+        out[:, 2 * k] = x
+        out[:, 2 * k + 1] = y
+
+
+# 小批量时 NumPy 临时数组的开销高于逐飞船循环，直接用纯 Python 标量实现
+SMALL_BATCH = 4
+
+
+def _step_ships_fallback(pos, vel, rot, actions, params, body_pos, body_gm, body_radius,
+                         field_ax, field_ay, out_status, out_rel_speed):
+    if pos.shape[0] > SMALL_BATCH:
+        _step_ships_numpy(pos, vel, rot, actions, params, body_pos, body_gm, body_radius,
+                          field_ax, field_ay, out_status, out_rel_speed)
+        return
+    # 一次性转换为 Python 列表，循环结束后写回
+    pos_list = pos.tolist()
+    vel_list = vel.tolist()
+    rot_list = rot.tolist()
+    status = out_status.tolist()
+    rel_speed = out_rel_speed.tolist()
+    _step_ships_loop(pos_list, vel_list, rot_list, actions.tolist(), params.tolist(),
+                     body_pos.tolist(), body_gm.tolist(), body_radius.tolist(),
+                     field_ax, field_ay, status, rel_speed)
+    pos[:] = pos_list
+    vel[:] = vel_list
+    rot[:] = rot_list
+    out_status[:] = status
+    out_rel_speed[:] = rel_speed
+
+
+def _predict_paths_fallback(pos, vel, steps, params, body_pos, body_gm,
+                            field_ax, field_ay, out):
+    if pos.shape[0] > SMALL_BATCH:
+        _predict_paths_numpy(pos, vel, steps, params, body_pos, body_gm,
+                             field_ax, field_ay, out)
+        return
+    rows = [[0.0] * (2 * steps) for _ in range(pos.shape[0])]
+    _predict_paths_loop(pos.tolist(), vel.tolist(), steps, params.tolist(),
+                        body_pos.tolist(), body_gm.tolist(), field_ax, field_ay, rows)
+    out[:] = rows
+
+
+# ---------------------------------------------------------------------------
+# 后端选择
+# ---------------------------------------------------------------------------
+
+def _select_backend(name):
+    if name == 'numba' and numba is None:
+        raise ImportError("PHYSICS_CONFIG['backend'] 为 'numba'，但未安装 numba")
+    if name == 'numpy' or (name == 'auto' and numba is None):
+        return 'numpy', _step_ships_fallback, _predict_paths_fallback
+
+    # cache=True：编译结果写入 __pycache__（或 NUMBA_CACHE_DIR），后续进程直接加载
+    jit = numba.njit(cache=True)
+    global _gravity_scalar
+    _gravity_scalar = jit(_gravity_scalar)
+    return 'numba', jit(_step_ships_loop), jit(_predict_paths_loop)
+
+
+BACKEND, _step_ships, _predict_paths = _select_backend(PHYSICS_CONFIG['backend'])
+
+_NO_FIELD = np.zeros((1, 1), dtype=np.float64)
+
+
+def step_ships(pos, vel, rot, actions, params, body_pos, body_gm, body_radius,
+               field=None, out_status=None, out_rel_speed=None):
+    """
+    推进一批飞船一步（原地修改 pos/vel/rot）
+    :param params: 形状 (N_PARAMS,) 的共用参数，或 (N, N_PARAMS) 的逐飞船参数
+    :param field: 可选的 (ax, ay) 引力场网格，需同时设置 params[P_USE_FIELD]
+    :return: (状态码数组, 相对目标速度数组)
+    """
+    n = pos.shape[0]
+    if params.ndim == 1:
+        params = params.reshape(1, N_PARAMS)
+    if out_status is None:
+        out_status = np.empty(n, dtype=np.int8)
+    if out_rel_speed is None:
+        out_rel_speed = np.empty(n, dtype=np.float64)
+    field_ax, field_ay = field if field is not None else (_NO_FIELD, _NO_FIELD)
+    _step_ships(pos, vel, rot, actions, params, body_pos, body_gm, body_radius,
+                field_ax, field_ay, out_status, out_rel_speed)
+    return out_status, out_rel_speed
+
+
+# step_ship 在 numba 后端使用的单飞船缓冲区（复用，避免每帧分配）
+_ONE_POS = np.zeros((1, 2))
+_ONE_VEL = np.zeros((1, 2))
+_ONE_ROT = np.zeros(1)
+_ONE_ACTIONS = np.zeros((1, 4), dtype=np.bool_)
+_ONE_STATUS = np.zeros(1, dtype=np.int8)
+_ONE_REL_SPEED = np.zeros(1)
+
+# NumPy 后端单飞船路径的天体列表副本：天体数组在环境构造后不再修改，按对象缓存最近一次的转换
+_body_lists_src = None
+_body_lists = None
+
+
+def _cached_body_lists(body_pos, body_gm, body_radius):
+    global _body_lists_src, _body_lists
+    src = _body_lists_src
+    if src is None or src[0] is not body_pos or src[1] is not body_gm or src[2] is not body_radius:
+        _body_lists_src = (body_pos, body_gm, body_radius)
+        _body_lists = (body_pos.tolist(), body_gm.tolist(), body_radius.tolist())
+    return _body_lists
+
+
+def step_ship(pos, vel, rotation, actions, params, body_pos, body_gm, body_radius, field=None):
+    """
+    推进单艘飞船一步（原地修改 [x, y] 列表 pos/vel）
+    NumPy 后端直接在列表上运行逐飞船循环，省去数组的填充和写回
+    :return: (新的旋转角度, 状态码, 相对目标速度)
+    """
+    field_ax, field_ay = field if field is not None else (_NO_FIELD, _NO_FIELD)
+    if BACKEND == 'numba':
+        pos_row = _ONE_POS[0]
+        vel_row = _ONE_VEL[0]
+        pos_row[0] = pos[0]
+        pos_row[1] = pos[1]
+        vel_row[0] = vel[0]
+        vel_row[1] = vel[1]
+        _ONE_ROT[0] = rotation
+        _ONE_ACTIONS[0] = actions[:4]
+        _step_ships(_ONE_POS, _ONE_VEL, _ONE_ROT, _ONE_ACTIONS, params.reshape(1, N_PARAMS),
+                    body_pos, body_gm, body_radius, field_ax, field_ay,
+                    _ONE_STATUS, _ONE_REL_SPEED)
+        pos[0], pos[1] = pos_row.tolist()
+        vel[0], vel[1] = vel_row.tolist()
+        return _ONE_ROT.item(), _ONE_STATUS.item(), _ONE_REL_SPEED.item()
+
+    rot = [rotation]
+    status = [STATUS_PLAYING]
+    rel_speed = [0.0]
+    body_pos, body_gm, body_radius = _cached_body_lists(body_pos, body_gm, body_radius)
+    _step_ships_loop([pos], [vel], rot, [actions], [params.tolist()],
+                     body_pos, body_gm, body_radius, field_ax, field_ay, status, rel_speed)
+    return rot[0], status[0], rel_speed[0]
+
+
+def predict_paths(pos, vel, steps, params, body_pos, body_gm, field=None, out=None):
+    """
+    预测一批飞船在仅受引力作用下的轨迹
+    :param out: 可选的预分配输出，形状 (N, steps, 2)，须为 C 连续数组
+    :return: 形状 (N, steps, 2) 的位置数组
+    """
+    n = pos.shape[0]
+    if out is None:
+        out = np.empty((n, steps, 2), dtype=np.float64)
+    field_ax, field_ay = field if field is not None else (_NO_FIELD, _NO_FIELD)
+    # 内核按 (N, steps * 2) 的视图写入
+    _predict_paths(pos, vel, steps, params, body_pos, body_gm, field_ax, field_ay,
+                   out.reshape(n, steps * 2))
+    return out
+
+
+def gravity_at(x, y, params, body_pos, body_gm, field=None):
+    """
+    计算单点引力加速度（与 step_ships 逐飞船路径为同一实现）
+    :param params: 参数数组，只使用引力场相关的 P_USE_FIELD/P_FIELD_CELL/P_FIELD_EXACT_RADIUS
+    :return: (ax, ay)
+    """
+    field_ax, field_ay = field if field is not None else (_NO_FIELD, _NO_FIELD)
+    return _gravity_scalar(x, y, body_pos, body_gm, field_ax, field_ay, params)
+
+
+def gravity_batch(positions, params, body_pos, body_gm, field=None):
+    """
+    批量计算引力加速度（与 NumPy 后端 step_ships 为同一实现）
+    :param positions: 形状 (N, 2) 的位置数组
+    :return: 形状 (N, 2) 的加速度数组
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    field_ax, field_ay = field if field is not None else (_NO_FIELD, _NO_FIELD)
+    ax, ay = _gravity_numpy(positions[:, 0], positions[:, 1], body_pos, body_gm,
+                            field_ax, field_ay, params)
+    return np.stack([ax, ay], axis=1)
+
+
+def warmup():
+    """预先编译/加载内核，避免首帧卡顿（NumPy 后端为空操作）"""
+    if BACKEND != 'numba':
+        return
+    params = make_params()
+    params[P_DT] = TIME_STEP
+    params[P_MAX_X] = params[P_MAX_Y] = 1.0
+    pos = np.zeros((1, 2))
+    vel = np.zeros((1, 2))
+    body = np.zeros((1, 2))
+    gm = np.ones(1)
+    step_ships(pos, vel, np.zeros(1), np.zeros((1, 4), dtype=np.bool_), params,
+               body, gm, gm)
+    predict_paths(pos, vel, 1, params, body, gm)
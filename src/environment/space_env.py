@@ -4,21 +4,51 @@ import numpy as np
 from config import *
 import random
 from environment.physics import PhysicsEngine
+from environment.gravity_field import GravityField
+from environment import kernels
+from environment.fleet import Fleet
+from utils.spatial import SpatialGrid
+from utils.helpers import RNG_STATE_WORDS, pack_rng_state, unpack_rng_state
+
+# 快照缓冲区布局：可变物理状态 + 随机数生成器状态（PCG64，按32位字存放）+ 飞船群状态
+SNAPSHOT_FIELDS = (
+    'ship_x', 'ship_y', 'ship_vx', 'ship_vy', 'ship_rotation', 'ship_angle',
+    'target_angle', 'target_x', 'target_y',
+    'disturber_orbit_angle', 'disturber_rotation_angle', 'disturber_x', 'disturber_y',
+    'tick', 'elapsed', 'ship_hit'
+)
+SNAPSHOT_RNG_OFFSET = len(SNAPSHOT_FIELDS)
+SNAPSHOT_FLEET_OFFSET = SNAPSHOT_RNG_OFFSET + RNG_STATE_WORDS
+SNAPSHOT_SIZE = SNAPSHOT_FLEET_OFFSET  # 不含飞船群时的大小，实际大小见 SpaceEnv.snapshot_size
+
 
 class SpaceEnv:
 
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def __init__(self, seed=None, headless=False, fleet_size=None):
+        """
+        :param seed: 随机种子
+        :param headless: 无界面模式：不创建窗口，也不生成只用于渲染的星空和空间索引（用于服务器和批量训练）
+        :param fleet_size: 共享世界中其他飞船的数量，默认取 FLEET_CONFIG['count']
+        """
+        self.screen = None if headless else pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.core = None  # 初始化时留空（会被GameCore覆盖）
+        self.rng = np.random.default_rng(seed)  # 环境独立的随机数生成器（可快照）
+        self.tick = 0  # 逻辑帧计数
         # 初始化恒星
         self.star = {
-            'pos': [SCREEN_WIDTH//2, SCREEN_HEIGHT//2],
+            'pos': list(WORLD_CONFIG['star_pos']),
             **STAR_CONFIG
         }
+
+        # 所有恒星（主恒星 + 其他恒星系统），未指定的属性沿用主恒星配置
+        self.bodies = [self.star] + [
+            {**STAR_CONFIG, **extra, 'pos': list(extra['pos'])}
+            for extra in WORLD_CONFIG['extra_stars']
+        ]
         
         # 初始化飞船
         self.ship = {
-            'pos': [100, SCREEN_HEIGHT-100],
+            'pos': list(WORLD_CONFIG['ship_start']),
             'velocity': [0, 0],
             'rotation': SHIP_CONFIG['initial_angle'],
             'angle': SHIP_CONFIG['initial_angle'],  # 添加angle字段
@@ -27,21 +57,88 @@ class SpaceEnv:
         
         # 初始化目标
         self.target = {
-            'angle': random.uniform(0, 2*math.pi),  # 随机初始角度
+            'angle': float(self.rng.uniform(0, 2*math.pi)),  # 随机初始角度
             **TARGET_CONFIG
         }
         self.update_target_position()
 
         # 初始化干扰行星
         self.disturber = {
-            'orbit_angle': random.uniform(0, 2*math.pi),  # 公转角度
+            'orbit_angle': float(self.rng.uniform(0, 2*math.pi)),  # 公转角度
             'rotation_angle': 0,                          # 自转角度
             **DISTURBER_CONFIG
         }
         self.update_disturber_position()
         
-        # 生成固定星空
-        self.stars = self.generate_stars()
+        # 生成固定星空和空间索引（背景星星和恒星，渲染时只取视口内的对象）；无界面模式下不需要
+        self.stars = []
+        self.star_index = None
+        self.body_index = None
+        if not headless:
+            self.stars = self.generate_stars()
+            cell = WORLD_CONFIG['index_cell_size']
+            self.star_index = SpatialGrid.from_points([s[:2] for s in self.stars], cell)
+            self.body_index = SpatialGrid.from_points(
+                [b['pos'] for b in self.bodies], cell,
+                radii=[b['radius'] for b in self.bodies]
+            )
+
+        # 静态天体引力场缓存（可选）
+        self.gravity_field = None
+        if GRAVITY_FIELD_CONFIG['enabled'] or (GRAVITY_FIELD_CONFIG['show_overlay'] and not headless):
+            self.gravity_field = GravityField.from_env(self)
+
+        # 物理内核使用的天体数组（静态，只构建一次）
+        self.body_pos = np.array([b['pos'] for b in self.bodies], dtype=np.float64)
+        self.body_gm = np.array([GRAVITY_CONSTANT * b['mass'] for b in self.bodies], dtype=np.float64)
+        self.body_radius = np.array([b['radius'] for b in self.bodies], dtype=np.float64)
+        self.params = kernels.make_params()
+        self._fill_static_params()
+
+        # 共享世界中的其他飞船
+        self.fleet = Fleet(FLEET_CONFIG['count'] if fleet_size is None else fleet_size, seed=seed)
+        self.fleet.check_capacity(self.bodies)
+        self.fleet.spawn(np.arange(self.fleet.size), self.bodies, avoid=[self.ship['pos']])
+        self.snapshot_size = SNAPSHOT_SIZE + self.fleet.state_size
+
+    def field_arrays(self):
+        """返回物理内核使用的引力场网格 (ax, ay)，未启用时返回 None"""
+        if self.gravity_field is not None and GRAVITY_FIELD_CONFIG['enabled']:
+            return self.gravity_field.arrays
+        return None
+
+    def _fill_static_params(self):
+        """填入物理内核参数中只依赖配置和初始状态的部分（构造时调用一次）"""
+        p = self.params
+        p[kernels.P_THRUST] = self.ship['thrust']
+        p[kernels.P_ROTATION_SPEED] = self.ship['rotation_speed']
+        p[kernels.P_SHIP_RADIUS] = self.ship['radius']
+        p[kernels.P_MIN_X] = 0
+        p[kernels.P_MIN_Y] = 0
+        p[kernels.P_MAX_X] = WORLD_CONFIG['width']
+        p[kernels.P_MAX_Y] = WORLD_CONFIG['height']
+        p[kernels.P_DISTURBER_RADIUS] = self.disturber['radius']
+        p[kernels.P_TARGET_RADIUS] = self.target['radius']
+        p[kernels.P_TARGET_VX], p[kernels.P_TARGET_VY] = PhysicsEngine.calculate_orbital_velocity(
+            self.star['pos'],
+            self.target['orbit_radius'],
+            self.target['angular_speed']
+        )
+        p[kernels.P_MAX_SPEED] = SUCCESS_CONDITIONS['max_speed']
+        p[kernels.P_MAX_ANGLE] = SUCCESS_CONDITIONS['max_angle_deviation']
+        field = self.field_arrays()
+        p[kernels.P_USE_FIELD] = field is not None
+        if field is not None:
+            p[kernels.P_FIELD_CELL] = self.gravity_field.cell_size
+            p[kernels.P_FIELD_EXACT_RADIUS] = self.gravity_field.exact_radius
+
+    def physics_params(self, dt=TIME_STEP):
+        """将每帧变化的环境状态（步长、目标与扰动天体位置）填入物理内核参数数组并返回"""
+        p = self.params
+        p[kernels.P_DT] = dt
+        p[kernels.P_DISTURBER_X], p[kernels.P_DISTURBER_Y] = self.disturber['pos']
+        p[kernels.P_TARGET_X], p[kernels.P_TARGET_Y] = self.target['pos']
+        return p
         
     def update_target_position(self):
         """更新目标位置"""
@@ -54,14 +151,15 @@ class SpaceEnv:
 
 
     def generate_stars(self):
-        """生成固定模式的星空"""
+        """生成固定模式的星空（覆盖整个世界，密度与单屏一致）"""
         random.seed(BACKGROUND_SEED)
         np.random.seed(BACKGROUND_SEED)
         
+        area_ratio = (WORLD_CONFIG['width'] * WORLD_CONFIG['height']) / (SCREEN_WIDTH * SCREEN_HEIGHT)
         stars = []
-        for _ in range(STAR_COUNT):
-            x = random.uniform(0, SCREEN_WIDTH)
-            y = random.uniform(0, SCREEN_HEIGHT)
+        for _ in range(int(round(STAR_COUNT * area_ratio))):
+            x = random.uniform(0, WORLD_CONFIG['width'])
+            y = random.uniform(0, WORLD_CONFIG['height'])
             size = random.randint(*STAR_SIZE_RANGE)
             brightness = random.randint(*STAR_BRIGHTNESS_RANGE)
             stars.append((x, y, size, brightness))
@@ -81,4 +179,68 @@ class SpaceEnv:
         self.disturber['rotation_angle'] = (
             self.disturber['rotation_angle'] + 
             self.disturber['rotation_speed']
-        ) % 360
\ No newline at end of file
+        ) % 360
+
+    def snapshot(self, out=None):
+        """
+        将可变物理状态写入定长缓冲区（不包含配置、贴图和屏幕）
+        包含飞船群的全部可变状态及其随机数生成器，恢复后与快照时完全一致
+        :param out: 可选的预分配缓冲区，形状 (snapshot_size,)
+        :return: float64 数组
+        """
+        if out is None:
+            out = np.empty(self.snapshot_size, dtype=np.float64)
+        ship = self.ship
+        core = self.core
+        elapsed = core.get_elapsed_time() if core is not None else 0.0
+        ship_hit = core.ship_hit if core is not None else False
+        out[:SNAPSHOT_RNG_OFFSET] = (
+            ship['pos'][0], ship['pos'][1],
+            ship['velocity'][0], ship['velocity'][1],
+            ship['rotation'], ship['angle'],
+            self.target['angle'], self.target['pos'][0], self.target['pos'][1],
+            self.disturber['orbit_angle'], self.disturber['rotation_angle'],
+            self.disturber['pos'][0], self.disturber['pos'][1],
+            self.tick, elapsed, ship_hit
+        )
+        pack_rng_state(self.rng, out[SNAPSHOT_RNG_OFFSET:SNAPSHOT_FLEET_OFFSET])
+        self.fleet.snapshot(out[SNAPSHOT_FLEET_OFFSET:self.snapshot_size])
+        return out
+
+    def restore(self, state):
+        """
+        从快照缓冲区恢复物理状态
+        :param state: snapshot() 返回的数组（或 fork_snapshot 结果中的一行）
+        """
+        (x, y, vx, vy, rotation, angle,
+         target_angle, target_x, target_y,
+         orbit_angle, rotation_angle, disturber_x, disturber_y,
+         tick, elapsed, ship_hit) = state[:SNAPSHOT_RNG_OFFSET].tolist()
+
+        self.ship['pos'] = [x, y]
+        self.ship['velocity'] = [vx, vy]
+        self.ship['rotation'] = rotation
+        self.ship['angle'] = angle
+        self.target['angle'] = target_angle
+        self.target['pos'] = [target_x, target_y]
+        self.disturber['orbit_angle'] = orbit_angle
+        self.disturber['rotation_angle'] = rotation_angle
+        self.disturber['pos'] = [disturber_x, disturber_y]
+        self.tick = int(tick)
+
+        unpack_rng_state(self.rng, state[SNAPSHOT_RNG_OFFSET:SNAPSHOT_FLEET_OFFSET])
+        self.fleet.restore(state[SNAPSHOT_FLEET_OFFSET:self.snapshot_size])
+
+        if self.core is not None:
+            self.core.set_elapsed_time(elapsed)
+            self.core.ship_hit = bool(ship_hit)
+
+    @staticmethod
+    def fork_snapshot(state, k):
+        """
+        将一个快照复制为 K 个子状态
+        :param state: snapshot() 返回的数组
+        :param k: 子状态数量
+        :return: 形状 (k, 快照长度) 的数组，每行可直接传给 restore()
+        """
+        return np.broadcast_to(state, (k, len(state))).copy()
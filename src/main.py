@@ -2,15 +2,18 @@ import pygame
 from environment.space_env import SpaceEnv
 from core.game_core import GameCore
 from render.renderer import GameRenderer
+from environment import kernels
 from config import *
 
 
 def main():
     pygame.init()
+    kernels.warmup()  # 预先加载物理内核（Numba 编译缓存）
     env = SpaceEnv()
     core = GameCore(env)
     renderer = GameRenderer(env)
     
+    clock = pygame.time.Clock()
     running = True
     while running:
         # 处理控制输入
@@ -19,6 +22,9 @@ def main():
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.MOUSEWHEEL:  # 鼠标滚轮缩放
+                renderer.camera.set_zoom(
+                    renderer.camera.zoom * CAMERA_CONFIG['zoom_step'] ** event.y)
                 
         keys = pygame.key.get_pressed()
         if keys[pygame.K_a] or keys[pygame.K_LEFT]:  # A键或左箭头键左转
@@ -29,9 +35,14 @@ def main():
             actions[2] = True
         if keys[pygame.K_s] or keys[pygame.K_DOWN]:  # S键或下箭头键反向推进
             actions[3] = True
+        if keys[pygame.K_EQUALS] or keys[pygame.K_e]:  # =键或E键放大
+            renderer.camera.set_zoom(renderer.camera.zoom * CAMERA_CONFIG['zoom_step'])
+        if keys[pygame.K_MINUS] or keys[pygame.K_q]:  # -键或Q键缩小
+            renderer.camera.set_zoom(renderer.camera.zoom / CAMERA_CONFIG['zoom_step'])
             
         # 更新游戏状态
         status = core.update(actions)
+        core.update_fleet()  # 共享世界中的其他飞船（自动驾驶）
         
         # 渲染画面（传递 actions 参数）
         renderer.draw(actions)
@@ -43,7 +54,8 @@ def main():
             renderer.trail_points = []  # 重置轨迹
             
         # 控制帧率
-        pygame.time.Clock().tick(60)  # 限制帧率为 60 FPS
+        clock.tick(GAME_CONFIG['fps'])  # 限制帧率（与帧计数时钟一致）
+        renderer.quality.record(clock.get_rawtime())  # 本帧实际耗时（不含等待）
 
     # 退出游戏
     pygame.quit()
@@ -0,0 +1,80 @@
+import numpy as np
+from config import *
+
+
+class Camera:
+    """
+    世界坐标到屏幕坐标的变换
+    跟随飞船并支持缩放；世界比视口小时居中显示
+    """
+
+    def __init__(self, world_width, world_height, screen_width, screen_height,
+                 zoom=None):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.zoom = CAMERA_CONFIG['zoom'] if zoom is None else zoom
+        # 视口中心（世界坐标）
+        self.center = [world_width / 2, world_height / 2]
+        self._clamp()
+
+    @property
+    def view_width(self):
+        return self.screen_width / self.zoom
+
+    @property
+    def view_height(self):
+        return self.screen_height / self.zoom
+
+    def _clamp(self):
+        """将视口限制在世界范围内"""
+        for axis, world, view in ((0, self.world_width, self.view_width),
+                                  (1, self.world_height, self.view_height)):
+            if view >= world:
+                self.center[axis] = world / 2
+            else:
+                self.center[axis] = min(max(self.center[axis], view / 2), world - view / 2)
+
+    def set_zoom(self, zoom):
+        """设置缩放倍数（限制在配置范围内）"""
+        self.zoom = min(max(zoom, CAMERA_CONFIG['min_zoom']), CAMERA_CONFIG['max_zoom'])
+        self._clamp()
+
+    def follow(self, pos, snap=False):
+        """平滑跟随目标位置"""
+        k = 1.0 if snap else CAMERA_CONFIG['follow_smoothing']
+        self.center[0] += (pos[0] - self.center[0]) * k
+        self.center[1] += (pos[1] - self.center[1]) * k
+        self._clamp()
+
+    def visible_rect(self, margin=0):
+        """返回视口在世界坐标中的范围 (x0, y0, x1, y1)"""
+        half_w = self.view_width / 2 + margin
+        half_h = self.view_height / 2 + margin
+        return (self.center[0] - half_w, self.center[1] - half_h,
+                self.center[0] + half_w, self.center[1] + half_h)
+
+    def is_visible(self, pos, radius=0):
+        """判断圆形对象是否与视口相交"""
+        x0, y0, x1, y1 = self.visible_rect(radius)
+        return x0 <= pos[0] <= x1 and y0 <= pos[1] <= y1
+
+    def to_screen(self, pos):
+        """世界坐标 -> 屏幕坐标"""
+        return (
+            (pos[0] - self.center[0]) * self.zoom + self.screen_width / 2,
+            (pos[1] - self.center[1]) * self.zoom + self.screen_height / 2
+        )
+
+    def to_screen_batch(self, positions):
+        """批量世界坐标 -> 屏幕坐标，positions 形状 (N, 2)"""
+        positions = np.asarray(positions, dtype=np.float64)
+        out = (positions - self.center) * self.zoom
+        out[..., 0] += self.screen_width / 2
+        out[..., 1] += self.screen_height / 2
+        return out
+
+    def scale(self, length):
+        """世界长度 -> 屏幕长度"""
+        return length * self.zoom
@@ -0,0 +1,150 @@
+import numpy as np
+import pygame
+from config import *
+
+
+class ParticleSystem:
+    """
+    定长预分配的推进器粒子池
+    存活粒子紧凑存放在数组前 count 个位置，发射、老化和剔除都是向量化操作；
+    绘制时按颜色和寿命阶段选取预渲染的辉光贴图，叠加混合一次性提交
+    """
+
+    def __init__(self, capacity=None, colors=None, seed=None):
+        """
+        :param capacity: 粒子总预算（池容量）
+        :param colors: 粒子颜色列表
+        :param seed: 随机种子
+        """
+        self.capacity = THRUSTER_CONFIG['particle_budget'] if capacity is None else capacity
+        self.colors = THRUSTER_CONFIG['particle_colors'] if colors is None else colors
+        self.rng = np.random.default_rng(seed)
+
+        self.pos = np.zeros((self.capacity, 2), dtype=np.float64)
+        self.vel = np.zeros((self.capacity, 2), dtype=np.float64)
+        self.age = np.zeros(self.capacity, dtype=np.float64)
+        self.life = np.ones(self.capacity, dtype=np.float64)
+        self.color = np.zeros(self.capacity, dtype=np.int8)
+        self.count = 0
+
+        self.levels = THRUSTER_CONFIG['particle_fade_levels']
+        self._sprites = None
+        self._sprite_zoom = None
+
+    def emit(self, pos, angle_rad, count, base_velocity=(0.0, 0.0)):
+        """
+        发射一批粒子（超出预算的部分丢弃）
+        :param pos: 发射点（世界坐标）
+        :param angle_rad: 喷射方向（弧度，y轴向上为正，与飞船旋转角一致）
+        :param count: 粒子数量
+        :param base_velocity: 继承的速度（世界坐标/帧）
+        """
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+        s = slice(self.count, self.count + count)
+        rng = self.rng
+
+        angles = angle_rad + rng.uniform(-1, 1, count) * THRUSTER_CONFIG['particle_angle_spread']
+        speeds = rng.uniform(*THRUSTER_CONFIG['particle_speed'], count)
+        jitter = THRUSTER_CONFIG['particle_spread']
+        self.pos[s, 0] = pos[0] + rng.uniform(-jitter, jitter, count) * 0.5
+        self.pos[s, 1] = pos[1] + rng.uniform(-jitter, jitter, count) * 0.5
+        self.vel[s, 0] = base_velocity[0] + speeds * np.cos(angles)
+        self.vel[s, 1] = base_velocity[1] - speeds * np.sin(angles)  # y轴向下
+        self.age[s] = 0
+        self.life[s] = rng.uniform(*THRUSTER_CONFIG['particle_lifetime'], count)
+        self.color[s] = rng.integers(0, len(self.colors), count)
+        self.count += count
+
+    def emit_many(self, positions, angles, per_emitter, base_velocities):
+        """
+        批量发射：每个发射点发射 per_emitter 个粒子（超出预算的部分丢弃）
+        :param positions: 形状 (N, 2) 的发射点
+        :param angles: 形状 (N,) 的喷射方向（弧度）
+        :param base_velocities: 形状 (N, 2) 的继承速度
+        """
+        total = min(len(positions) * per_emitter, self.capacity - self.count)
+        if total <= 0:
+            return
+        src = np.repeat(np.arange(len(positions)), per_emitter)[:total]
+        s = slice(self.count, self.count + total)
+        rng = self.rng
+
+        angles = angles[src] + rng.uniform(-1, 1, total) * THRUSTER_CONFIG['particle_angle_spread']
+        speeds = rng.uniform(*THRUSTER_CONFIG['particle_speed'], total)
+        jitter = THRUSTER_CONFIG['particle_spread']
+        self.pos[s] = positions[src] + rng.uniform(-jitter, jitter, (total, 2)) * 0.5
+        self.vel[s, 0] = base_velocities[src, 0] + speeds * np.cos(angles)
+        self.vel[s, 1] = base_velocities[src, 1] - speeds * np.sin(angles)  # y轴向下
+        self.age[s] = 0
+        self.life[s] = rng.uniform(*THRUSTER_CONFIG['particle_lifetime'], total)
+        self.color[s] = rng.integers(0, len(self.colors), total)
+        self.count += total
+
+    def update(self, dt=1.0):
+        """推进所有粒子并剔除过期粒子"""
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n] * dt
+        self.vel[:n] *= THRUSTER_CONFIG['particle_drag']
+        self.age[:n] += dt
+
+        alive = self.age[:n] < self.life[:n]
+        kept = int(alive.sum())
+        if kept < n:
+            # 将存活粒子压缩到数组前部
+            for arr in (self.pos, self.vel, self.age, self.life, self.color):
+                arr[:kept] = arr[:n][alive]
+            self.count = kept
+
+    def clear(self):
+        self.count = 0
+
+    def _build_sprites(self, zoom):
+        """预渲染每种颜色、每个寿命阶段的辉光贴图（RGB，黑底，用于叠加混合）"""
+        base_radius = THRUSTER_CONFIG['particle_sprite_radius'] * zoom
+        sprites = []
+        for color in self.colors:
+            row = []
+            for level in range(self.levels):
+                fade = 1 - level / self.levels  # 越老越暗越小
+                radius = max(1, int(round(base_radius * (0.5 + 0.5 * fade))))
+                size = radius * 2 + 1
+                yy, xx = np.mgrid[0:size, 0:size] - radius
+                falloff = np.clip(1 - np.hypot(xx, yy) / (radius + 0.5), 0, 1) ** 2 * fade
+                rgb = (falloff[..., None] * np.array(color, dtype=np.float64)).astype(np.uint8)
+                surface = pygame.surfarray.make_surface(rgb.transpose(1, 0, 2))
+                row.append((surface, radius))
+            sprites.append(row)
+        self._sprites = sprites
+        self._sprite_zoom = zoom
+
+    def draw(self, screen, camera):
+        """绘制视口内的粒子"""
+        n = self.count
+        if n == 0:
+            return
+        if self._sprites is None or self._sprite_zoom != camera.zoom:
+            self._build_sprites(camera.zoom)
+
+        points = camera.to_screen_batch(self.pos[:n])
+        width, height = screen.get_size()
+        visible = ((points[:, 0] >= 0) & (points[:, 0] < width) &
+                   (points[:, 1] >= 0) & (points[:, 1] < height))
+        if not visible.any():
+            return
+        points = points[visible].astype(np.int32)
+        colors = self.color[:n][visible].tolist()
+        levels = np.minimum(
+            (self.age[:n][visible] / self.life[:n][visible] * self.levels).astype(np.int32),
+            self.levels - 1
+        ).tolist()
+
+        sprites = self._sprites
+        batch = []
+        for (x, y), c, level in zip(points.tolist(), colors, levels):
+            surface, radius = sprites[c][level]
+            batch.append((surface, (x - radius, y - radius), None, pygame.BLEND_RGB_ADD))
+        screen.blits(batch, doreturn=False)
@@ -0,0 +1,70 @@
+from collections import deque
+from config import *
+
+
+class QualityGovernor:
+    """
+    根据实测帧耗时自动调整渲染质量
+    统计最近若干帧的平均耗时：超出帧预算时降一级，余量充足时升一级；
+    升降阈值之间留有间隔，每次切换后经过短暂冷却才会再次判定；
+    升级还要求余量持续足够长的时间，曾因超预算降级过的等级需要等待更久，避免来回振荡
+    """
+
+    def __init__(self, levels=None, target_fps=None):
+        self.levels = QUALITY_CONFIG['levels'] if levels is None else levels
+        target_fps = GAME_CONFIG['fps'] if target_fps is None else target_fps
+        self.budget_ms = 1000 / target_fps
+        self.samples = deque(maxlen=QUALITY_CONFIG['window'])
+        self.index = 0
+        self.cooldown = 0
+        # 平均耗时持续低于升级阈值的帧数，余量不足时清零
+        self.upgrade_wait = 0
+        # 每个等级因超预算被降级的次数越多，再次升回该等级前需要的余量持续时间越长
+        self.backoff = [1] * len(self.levels)
+
+    @property
+    def level(self):
+        """当前质量等级的设置"""
+        return self.levels[self.index]
+
+    @property
+    def average_ms(self):
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    def set_index(self, index):
+        """切换到指定等级并重新开始统计"""
+        index = min(max(index, 0), len(self.levels) - 1)
+        if index == self.index:
+            return
+        if index > self.index:
+            self.backoff[self.index] = min(self.backoff[self.index] * 2, QUALITY_CONFIG['max_backoff'])
+        # 冷却在两个方向上都保持较短，升级后若帧耗时超预算仍能及时降回
+        self.cooldown = QUALITY_CONFIG['cooldown']
+        self.upgrade_wait = 0
+        self.index = index
+        self.samples.clear()
+
+    def record(self, frame_ms):
+        """
+        记录一帧的耗时（不含帧率限制的等待时间）
+        :param frame_ms: 帧耗时（毫秒）
+        """
+        if not QUALITY_CONFIG['enabled']:
+            return
+        self.samples.append(frame_ms)
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return
+        if len(self.samples) < self.samples.maxlen:
+            return
+
+        average = self.average_ms
+        if average > self.budget_ms * QUALITY_CONFIG['downgrade_ratio']:
+            self.set_index(self.index + 1)
+        elif average < self.budget_ms * QUALITY_CONFIG['upgrade_ratio'] and self.index > 0:
+            # 升级前要求余量持续 window * backoff 帧
+            self.upgrade_wait += 1
+            if self.upgrade_wait >= self.samples.maxlen * self.backoff[self.index - 1]:
+                self.set_index(self.index - 1)
+        else:
+            self.upgrade_wait = 0
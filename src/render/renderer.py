@@ -1,7 +1,12 @@
 import pygame
 import math
 from config import *
+import numpy as np
 from environment.physics import PhysicsEngine
+from environment import kernels
+from render.camera import Camera
+from render.particles import ParticleSystem
+from render.quality import QualityGovernor
 import random
 
 
@@ -36,6 +41,48 @@ class GameRenderer:
                             (2 * globals()[f"{obj.upper()}_CONFIG"]['radius'],) * 2
                         )
 
+        # 摄像机：世界坐标 -> 屏幕坐标
+        self.camera = Camera(WORLD_CONFIG['width'], WORLD_CONFIG['height'],
+                             SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.camera.follow(self.env.ship['pos'], snap=True)
+        self._scaled_textures = {}
+        self._scaled_zoom = 1.0
+        self._overlay_cache = None
+
+        # 推进器粒子池
+        self.particles = ParticleSystem()
+
+        # 渲染质量自适应
+        self.quality = QualityGovernor()
+
+        # 共享世界飞船的预旋转贴图（按缩放倍数和绘制模式缓存）
+        self._fleet_sprites = None
+        self._fleet_sprites_key = None
+
+    def use_textures(self, name):
+        """当前质量等级下是否使用贴图绘制该对象"""
+        return USE_TEXTURES and self.quality.level['textures'] and name in self.textures
+
+    def get_texture(self, name, radius=None):
+        """
+        获取按当前缩放倍数缩放后的贴图（按缩放倍数缓存）
+        :param radius: 可选，按该半径缩放（用于尺寸与配置不同的恒星），按 (贴图, 半径) 缓存
+        """
+        zoom = self.camera.zoom
+        if zoom == 1.0 and radius is None:
+            return self.textures[name]
+        if zoom != self._scaled_zoom:
+            self._scaled_textures = {}
+            self._scaled_zoom = zoom
+        key = name if radius is None else (name, radius)
+        if key not in self._scaled_textures:
+            if radius is None:
+                w, h = self.textures[name].get_size()
+                size = (max(1, int(w * zoom)), max(1, int(h * zoom)))
+            else:
+                size = (max(1, int(self.camera.scale(radius * 2))),) * 2
+            self._scaled_textures[key] = pygame.transform.smoothscale(self.textures[name], size)
+        return self._scaled_textures[key]
 
 
     def draw_background(self):
@@ -43,16 +90,23 @@ class GameRenderer:
         if not RENDER_BACKGROUND:
             return
         
+        # 通过空间索引只取视口内的星星
+        visible = self.env.star_index.query_rect(*self.camera.visible_rect(STAR_SIZE_RANGE[1]))
+        if len(visible) == 0:
+            return
+
         # 绘制基础星空
-        for star in self.env.stars:
-            x, y, size, brightness = star
+        for idx in visible.tolist():
+            x, y, size, brightness = self.env.stars[idx]
             color = (brightness, brightness, brightness)
-            pygame.draw.circle(self.env.screen, color, (int(x), int(y)), size)
+            sx, sy = self.camera.to_screen((x, y))
+            pygame.draw.circle(self.env.screen, color, (int(sx), int(sy)), size)
         
         # 添加美观效果：随机闪烁的星星
-        if random.random() < 0.02:  # 2%概率出现闪烁
-            idx = random.randint(0, len(self.env.stars)-1)
+        if random.random() < self.quality.level['twinkle_rate']:  # 按质量等级的概率出现闪烁
+            idx = int(visible[random.randint(0, len(visible)-1)])
             x, y, base_size, _ = self.env.stars[idx]
+            x, y = self.camera.to_screen((x, y))
             glow_size = base_size * 3
             alpha = random.randint(100, 150)
             surface = pygame.Surface((glow_size*2, glow_size*2), pygame.SRCALPHA)
@@ -60,24 +114,75 @@ class GameRenderer:
                              (glow_size, glow_size), glow_size)
             self.env.screen.blit(surface, (x-glow_size, y-glow_size))
 
+    def draw_gravity_overlay(self):
+        """绘制引力势阱热力图"""
+        field = self.env.gravity_field
+        if field is None or not GRAVITY_FIELD_CONFIG['show_overlay']:
+            return
+        heatmap = field.heatmap_surface()
+
+        # 视口对应的网格区域（每个热力图像素对应一个网格节点）
+        x0, y0, x1, y1 = self.camera.visible_rect()
+        gx0 = max(0, int(x0 / field.cell_size))
+        gy0 = max(0, int(y0 / field.cell_size))
+        gx1 = min(field.nx, int(math.ceil(x1 / field.cell_size)) + 1)
+        gy1 = min(field.ny, int(math.ceil(y1 / field.cell_size)) + 1)
+        if gx1 <= gx0 or gy1 <= gy0:
+            return
+
+        key = (gx0, gy0, gx1, gy1, self.camera.zoom)
+        if self._overlay_cache is None or self._overlay_cache[0] != key:
+            sub = heatmap.subsurface((gx0, gy0, gx1 - gx0, gy1 - gy0))
+            size = (max(1, int(self.camera.scale((gx1 - gx0) * field.cell_size))),
+                    max(1, int(self.camera.scale((gy1 - gy0) * field.cell_size))))
+            scaled = pygame.transform.smoothscale(sub, size)
+            scaled.set_alpha(heatmap.get_alpha())
+            self._overlay_cache = (key, scaled)
+        top_left = self.camera.to_screen((gx0 * field.cell_size, gy0 * field.cell_size))
+        self.env.screen.blit(self._overlay_cache[1], top_left)
+
+    def draw_bodies(self):
+        """绘制视口内的恒星"""
+        margin = max(b['radius'] for b in self.env.bodies)
+        visible = self.env.body_index.query_rect(*self.camera.visible_rect(margin))
+        for idx in visible.tolist():
+            body = self.env.bodies[idx]
+            if not self.camera.is_visible(body['pos'], body['radius']):
+                continue
+            center = self.camera.to_screen(body['pos'])
+            if self.use_textures('star'):
+                if body['radius'] != STAR_CONFIG['radius']:
+                    texture = self.get_texture('star', body['radius'])
+                else:
+                    texture = self.get_texture('star')
+                rect = texture.get_rect(center=center)
+                self.env.screen.blit(texture, rect)
+            else:
+                pygame.draw.circle(self.env.screen, body['color'],
+                                   center, self.camera.scale(body['radius']))
+
     def draw_disturber(self):
         """绘制双星系统"""
         d = self.env.disturber
-        if USE_TEXTURES and 'disturber' in self.textures:
+        if not self.camera.is_visible(d['pos'], d['radius']):
+            return
+        center = self.camera.to_screen(d['pos'])
+        if self.use_textures('disturber'):
             # 旋转贴图
-            rotated = pygame.transform.rotate(self.textures['disturber'], d['rotation_angle'])
-            rect = rotated.get_rect(center=d['pos'])
+            rotated = pygame.transform.rotate(self.get_texture('disturber'), d['rotation_angle'])
+            rect = rotated.get_rect(center=center)
             self.env.screen.blit(rotated, rect)
         else:
             # 矢量图形模式
-            pygame.draw.circle(self.env.screen, d['color'], d['pos'], d['radius'])
+            radius = self.camera.scale(d['radius'])
+            pygame.draw.circle(self.env.screen, d['color'], center, radius)
             # 绘制自转标记
             angle_rad = math.radians(d['rotation_angle'])
             marker = (
-                d['pos'][0] + d['radius']*math.cos(angle_rad),
-                d['pos'][1] - d['radius']*math.sin(angle_rad)
+                center[0] + radius*math.cos(angle_rad),
+                center[1] - radius*math.sin(angle_rad)
             )
-            pygame.draw.line(self.env.screen, (0,0,0), d['pos'], marker, 2)
+            pygame.draw.line(self.env.screen, (0,0,0), center, marker, 2)
 
     def update_trail(self, ship_pos):
         """更新飞行轨迹"""
@@ -88,30 +193,134 @@ class GameRenderer:
     def draw_trail(self):
         """绘制飞行轨迹"""
         if len(self.trail_points) > 1:
+            # 按质量等级抽稀轨迹点（保留最新的点）
+            step = self.quality.level['trail_step']
+            points = self.camera.to_screen_batch(self.trail_points[::-1][::step][::-1])
+            if len(points) < 2:
+                return
+            onscreen = self.onscreen_segments(points)
             # 使用渐变色绘制轨迹
-            for i in range(1, len(self.trail_points)):
-                alpha = int(255 * (i / len(self.trail_points)))
+            for i in np.nonzero(onscreen)[0].tolist():
+                alpha = int(255 * ((i + 1) / len(points)))
                 color = (100, 100, 255, alpha)
-                start_pos = self.trail_points[i-1]
-                end_pos = self.trail_points[i]
-                pygame.draw.line(self.env.screen, color, start_pos, end_pos, 2)
+                pygame.draw.line(self.env.screen, color, points[i], points[i+1], 2)
+
+    def onscreen_segments(self, points):
+        """
+        返回折线中与屏幕相交的线段掩码，points 为屏幕坐标 (N, 2)
+        两个端点都在屏幕外但穿过屏幕的线段（高倍缩放时的长线段）同样保留
+        """
+        p0 = points[:-1]
+        p1 = points[1:]
+        lo = np.minimum(p0, p1)
+        hi = np.maximum(p0, p1)
+        # 包围盒与屏幕相交
+        overlap = ((hi[:, 0] >= 0) & (lo[:, 0] <= SCREEN_WIDTH) &
+                   (hi[:, 1] >= 0) & (lo[:, 1] <= SCREEN_HEIGHT))
+        # 且屏幕四个角不全在线段所在直线的同一侧（分离轴判定）
+        dx = p1[:, 0] - p0[:, 0]
+        dy = p1[:, 1] - p0[:, 1]
+        sides = np.stack([
+            dx * (cy - p0[:, 1]) - dy * (cx - p0[:, 0])
+            for cx, cy in ((0, 0), (SCREEN_WIDTH, 0), (0, SCREEN_HEIGHT), (SCREEN_WIDTH, SCREEN_HEIGHT))
+        ])
+        return overlap & (sides.min(axis=0) <= 0) & (sides.max(axis=0) >= 0)
 
     def draw_rotated_ship(self):
         """绘制带旋转的飞船"""
         ship = self.env.ship
-        if USE_TEXTURES and 'ship' in self.textures:
-            texture = pygame.transform.rotate(self.textures['ship'], ship['rotation'])
-            rect = texture.get_rect(center=ship['pos'])
+        center = self.camera.to_screen(ship['pos'])
+        if self.use_textures('ship'):
+            texture = pygame.transform.rotate(self.get_texture('ship'), ship['rotation'])
+            rect = texture.get_rect(center=center)
             self.env.screen.blit(texture, rect)
         else:
             # 绘制矢量图形
+            radius = self.camera.scale(ship['radius'])
             angle_rad = math.radians(ship['rotation'])
             nose = (
-                ship['pos'][0] + ship['radius'] * math.cos(angle_rad),
-                ship['pos'][1] - ship['radius'] * math.sin(angle_rad)
+                center[0] + radius * math.cos(angle_rad),
+                center[1] - radius * math.sin(angle_rad)
             )
-            pygame.draw.circle(self.env.screen, (100, 100, 255), ship['pos'], ship['radius'])
-            pygame.draw.line(self.env.screen, (255,255,0), ship['pos'], nose, 3)
+            pygame.draw.circle(self.env.screen, (100, 100, 255), center, radius)
+            pygame.draw.line(self.env.screen, (255,255,0), center, nose, 3)
+
+    def get_fleet_sprites(self):
+        """按角度档预渲染飞船贴图，返回 [(surface, 半宽, 半高), ...]"""
+        textured = self.use_textures('ship')
+        key = (self.camera.zoom, textured)
+        if self._fleet_sprites_key == key:
+            return self._fleet_sprites
+
+        buckets = FLEET_CONFIG['rotation_buckets']
+        if textured:
+            base = self.get_texture('ship')
+        else:
+            # 矢量模式：绘制一次未旋转的飞船（机头朝右）
+            radius = max(2, int(self.camera.scale(SHIP_CONFIG['radius'])))
+            base = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(base, (100, 100, 255), (radius, radius), radius)
+            pygame.draw.line(base, (255, 255, 0), (radius, radius), (radius * 2, radius), 3)
+        sprites = []
+        for b in range(buckets):
+            rotated = pygame.transform.rotate(base, b * 360 / buckets)
+            w, h = rotated.get_size()
+            sprites.append((rotated, w // 2, h // 2))
+        self._fleet_sprites = sprites
+        self._fleet_sprites_key = key
+        return sprites
+
+    def draw_fleet(self):
+        """批量绘制共享世界中视口内的飞船，并为点火的飞船发射粒子"""
+        fleet = self.env.fleet
+        if fleet.size == 0:
+            return
+        active = np.flatnonzero(fleet.active)
+        points = self.camera.to_screen_batch(fleet.pos[active])
+        margin = self.camera.scale(SHIP_CONFIG['radius']) * 2
+        visible = ((points[:, 0] >= -margin) & (points[:, 0] <= SCREEN_WIDTH + margin) &
+                   (points[:, 1] >= -margin) & (points[:, 1] <= SCREEN_HEIGHT + margin))
+        idx = active[visible]
+        if len(idx) == 0:
+            return
+
+        sprites = self.get_fleet_sprites()
+        buckets = len(sprites)
+        bucket = np.round(fleet.rot[idx] % 360 / (360 / buckets)).astype(np.int32) % buckets
+        batch = []
+        for (x, y), b in zip(points[visible].astype(np.int32).tolist(), bucket.tolist()):
+            surface, half_w, half_h = sprites[b]
+            batch.append((surface, (x - half_w, y - half_h)))
+        self.env.screen.blits(batch, doreturn=False)
+
+        # 主推进器尾焰粒子（受全局粒子预算限制）
+        if self.quality.level['particles']:
+            thrusting = idx[fleet.actions[idx, 2]]
+            if len(thrusting):
+                angle = np.radians(fleet.rot[thrusting])
+                reach = -2.0 * SHIP_CONFIG['radius']
+                emit_pos = np.stack([
+                    fleet.pos[thrusting, 0] + reach * np.cos(angle),
+                    fleet.pos[thrusting, 1] - reach * np.sin(angle)
+                ], axis=1)
+                self.particles.emit_many(
+                    emit_pos, angle + math.pi,
+                    FLEET_CONFIG['particles_per_ship'],
+                    fleet.vel[thrusting] * TIME_STEP
+                )
+
+    def draw_fleet_panel(self):
+        """显示共享世界飞船的统计"""
+        fleet = self.env.fleet
+        if fleet.size == 0:
+            return
+        font = pygame.font.Font(None, 24)
+        landed = int(fleet.outcomes[kernels.STATUS_SUCCESS])
+        crashed = int(fleet.outcomes.sum()) - landed
+        text = font.render(
+            f"Fleet: {int(fleet.active.sum())}/{fleet.size}  landed {landed}  lost {crashed}",
+            True, (160, 160, 160))
+        self.env.screen.blit(text, (SCREEN_WIDTH - text.get_width() - 10, 60))
 
     def draw_thrusters(self, actions):
         """改进的推进器效果"""
@@ -152,10 +361,11 @@ class GameRenderer:
         :param color: 火焰颜色
         :param offset: 火焰位置偏移（1: 前方, -1: 后方, 0.5: 侧面）
         """
-        # 计算火焰起点
+        # 计算火焰起点（世界坐标）
+        ship_radius = self.env.ship['radius']
         start_pos = (
-            ship_pos[0] + offset * self.env.ship['radius'] * math.cos(angle_rad),
-            ship_pos[1] - offset * self.env.ship['radius'] * math.sin(angle_rad)
+            ship_pos[0] + offset * ship_radius * math.cos(angle_rad),
+            ship_pos[1] - offset * ship_radius * math.sin(angle_rad)
         )
         
         # 根据推进方向调整终点
@@ -168,22 +378,20 @@ class GameRenderer:
         # 绘制火焰
         pygame.draw.line(
             self.env.screen, color,
-            start_pos, end_pos,
+            self.camera.to_screen(start_pos), self.camera.to_screen(end_pos),
             width=5
         )
         
-        # 粒子效果
-        for _ in range(5):
-            spread = 5
-            particle_pos = (
-                end_pos[0] + random.uniform(-spread, spread),
-                end_pos[1] + random.uniform(-spread, spread)
-            )
-            pygame.draw.circle(
-                self.env.screen, (255, 200, 100),
-                particle_pos,
-                random.randint(1, 2)
-            )
+        # 粒子效果：从火焰末端沿喷射方向发射，并继承飞船速度
+        if not self.quality.level['particles']:
+            return
+        velocity = self.env.ship['velocity']
+        self.particles.emit(
+            end_pos,
+            angle_rad if end_offset > 0 else angle_rad + math.pi,
+            THRUSTER_CONFIG['particle_count'],
+            base_velocity=(velocity[0] * TIME_STEP, velocity[1] * TIME_STEP)
+        )
 
 
     def draw_info_panel(self):
@@ -212,8 +420,9 @@ class GameRenderer:
     
         
         # 显示位置（目标右侧）
-        text_x = target_pos[0] + self.env.target['radius'] + 20
-        text_y = target_pos[1] - 20
+        screen_pos = self.camera.to_screen(target_pos)
+        text_x = screen_pos[0] + self.camera.scale(self.env.target['radius']) + 20
+        text_y = screen_pos[1] - 20
         
         # 颜色判断
         color = (173, 216, 230) if rel_speed < 5 else (255, 182, 193)
@@ -231,8 +440,10 @@ class GameRenderer:
     def draw_target_decorations(self):
         """绘制目标行星的装饰效果"""
         target = self.env.target
-        center = target['pos']
-        radius = target['radius'] * 1.5  # 装饰圈半径
+        if not self.camera.is_visible(target['pos'], target['radius'] * 1.5):
+            return
+        center = self.camera.to_screen(target['pos'])
+        radius = self.camera.scale(target['radius'] * 1.5)  # 装饰圈半径
         
         # 获取与信息面板一致的颜色
         ship_pos = self.env.ship['pos']
@@ -263,30 +474,23 @@ class GameRenderer:
 
     def draw_predicted_trajectory(self, steps=100, dt=0.1):
         """绘制预测轨迹"""
-        # 复制当前状态进行模拟
-        pos = list(self.env.ship['pos'])
-        velocity = list(self.env.ship['velocity'])
-        points = []
-        
-        for _ in range(steps):
-            # 计算引力
-            gravity = PhysicsEngine.calculate_gravity(
-                pos, self.env.star['pos'], self.env.star['mass'], GRAVITY_CONSTANT)
-            
-            # 更新速度和位置
-            velocity[0] += gravity[0] * dt
-            velocity[1] += gravity[1] * dt
-            pos[0] += velocity[0] * dt
-            pos[1] += velocity[1] * dt
-            
-            points.append(tuple(pos))
+        # 复制当前状态，用物理内核批量模拟
+        pos = np.array([self.env.ship['pos']], dtype=np.float64)
+        velocity = np.array([self.env.ship['velocity']], dtype=np.float64)
+        path = kernels.predict_paths(
+            pos, velocity, steps, self.env.physics_params(dt),
+            self.env.body_pos, self.env.body_gm,
+            field=self.env.field_arrays()
+        )
+        points = self.camera.to_screen_batch(path[0])
             
-        # 绘制预测轨迹
+        # 绘制预测轨迹（跳过屏幕外的线段）
         if len(points) > 1:
-            for i in range(1, len(points)):
-                alpha = int(255 * (0.2 + 0.8 * (i / len(points))))
+            onscreen = self.onscreen_segments(points)
+            for i in np.nonzero(onscreen)[0].tolist():
+                alpha = int(255 * (0.2 + 0.8 * ((i + 1) / len(points))))
                 color = (255, 100, 100, alpha)
-                pygame.draw.line(self.env.screen, color, points[i-1], points[i], 1)
+                pygame.draw.line(self.env.screen, color, points[i], points[i+1], 1)
 
 
     def draw_orbit_decorations(self):
@@ -318,6 +522,9 @@ class GameRenderer:
         :param dash_length: 每段虚线长度
         :param gap_length: 每段间隔长度
         """
+        center = self.camera.to_screen(center)
+        radius = self.camera.scale(radius)
+
         # 计算圆周长
         circumference = 2 * math.pi * radius
         num_segments = int(circumference / (dash_length + gap_length))
@@ -344,16 +551,30 @@ class GameRenderer:
         font = pygame.font.Font(None, 24)
         text = font.render(f"Time: {int(remaining_time)}s", True, color)
         self.env.screen.blit(text, (SCREEN_WIDTH - 120, 10))
+
+    def draw_quality_panel(self):
+        """显示当前渲染质量等级和平均帧耗时"""
+        font = pygame.font.Font(None, 24)
+        text = font.render(
+            f"Quality: {self.quality.level['name']} ({self.quality.average_ms:.1f}ms)",
+            True, (160, 160, 160))
+        self.env.screen.blit(text, (SCREEN_WIDTH - text.get_width() - 10, 35))
         
     def draw(self, actions):
         """主绘制方法"""
         self.env.screen.fill((0, 0, 0))
 
+        # 摄像机跟随飞船
+        self.camera.follow(self.env.ship['pos'])
+
         # 绘制时间面板
         self.draw_time_panel()
 
         self.draw_background()
 
+        # 绘制引力势阱叠加层
+        self.draw_gravity_overlay()
+
         # 绘制轨道装饰
         # self.draw_orbit_decorations()
 
@@ -363,23 +584,22 @@ class GameRenderer:
         self.draw_trail()
         
         # 绘制预测轨迹
-        self.draw_predicted_trajectory()
+        self.draw_predicted_trajectory(steps=self.quality.level['prediction_steps'])
         
         # 绘制恒星
-        if USE_TEXTURES and 'star' in self.textures:
-            rect = self.textures['star'].get_rect(center=self.env.star['pos'])
-            self.env.screen.blit(self.textures['star'], rect)
-        else:
-            pygame.draw.circle(self.env.screen, (255, 215, 0),
-                             self.env.star['pos'], self.env.star['radius'])
+        self.draw_bodies()
         
         # 绘制目标行星
-        if USE_TEXTURES and 'target' in self.textures:
-            rect = self.textures['target'].get_rect(center=self.env.target['pos'])
-            self.env.screen.blit(self.textures['target'], rect)
-        else:
-            pygame.draw.circle(self.env.screen, (0, 255, 0),
-                            self.env.target['pos'], self.env.target['radius'])
+        target = self.env.target
+        if self.camera.is_visible(target['pos'], target['radius']):
+            center = self.camera.to_screen(target['pos'])
+            if self.use_textures('target'):
+                texture = self.get_texture('target')
+                rect = texture.get_rect(center=center)
+                self.env.screen.blit(texture, rect)
+            else:
+                pygame.draw.circle(self.env.screen, (0, 255, 0),
+                                center, self.camera.scale(target['radius']))
 
         # 新增：绘制目标装饰UI
         self.draw_target_decorations()
@@ -387,13 +607,23 @@ class GameRenderer:
         # 绘制干扰行星
         self.draw_disturber()
 
+        # 绘制共享世界中的其他飞船
+        self.draw_fleet()
+
         # 绘制飞船
         self.draw_rotated_ship()
         
         # 绘制推进器效果
         self.draw_thrusters(actions)
+        if self.quality.level['particles']:
+            self.particles.update()
+            self.particles.draw(self.env.screen, self.camera)
+        else:
+            self.particles.clear()
         
         # 绘制信息面板
         self.draw_info_panel()
+        self.draw_quality_panel()
+        self.draw_fleet_panel()
         
         pygame.display.flip()
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+模拟服务器压力测试客户端，报告往返延迟分位数和吞吐量
+
+用法（在 src 目录下，先启动 server.sim_server）：
+    python -m server.load_test --clients 64 --steps 1000 --tcp 127.0.0.1:7777
+"""
+import argparse
+import asyncio
+import random
+import time
+from server.protocol import OBSERVATION_SIZE, encode_action, unpack_observation, parse_address
+
+
+async def run_client(kind, address, steps, seed):
+    """单个客户端：逐步发送随机动作，返回每步往返延迟（秒）"""
+    if kind == 'unix':
+        reader, writer = await asyncio.open_unix_connection(address)
+    else:
+        reader, writer = await asyncio.open_connection(*address)
+
+    rng = random.Random(seed)
+    latencies = []
+    statuses = {}
+    for _ in range(steps):
+        actions = [rng.random() < 0.3 for _ in range(4)]
+        start = time.perf_counter()
+        writer.write(encode_action(actions))
+        data = await reader.readexactly(OBSERVATION_SIZE)
+        latencies.append(time.perf_counter() - start)
+
+        status = unpack_observation(data)['status']
+        statuses[status] = statuses.get(status, 0) + 1
+
+    writer.close()
+    await writer.wait_closed()
+    return latencies, statuses
+
+
+def percentile(sorted_values, p):
+    """最近秩法计算分位数"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def load_test(kind, address, clients, steps):
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_client(kind, address, steps, seed) for seed in range(clients))
+    )
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(l for client_latencies, _ in results for l in client_latencies)
+    statuses = {}
+    for _, client_statuses in results:
+        for status, count in client_statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+
+    total = len(latencies)
+    print(f"clients={clients} steps/client={steps} total={total} time={elapsed:.2f}s")
+    print(f"throughput: {total / elapsed:.0f} steps/s")
+    print("latency (ms): " + "  ".join(
+        f"p{p}={percentile(latencies, p) * 1000:.3f}" for p in (50, 90, 99, 99.9)
+    ) + f"  max={latencies[-1] * 1000:.3f}")
+    print(f"statuses: {statuses}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gravity slingshot server load test')
+    parser.add_argument('--tcp', help='HOST:PORT（默认 127.0.0.1:7777）')
+    parser.add_argument('--unix', help='Unix 套接字路径')
+    parser.add_argument('--clients', type=int, default=32, help='并发客户端数')
+    parser.add_argument('--steps', type=int, default=500, help='每个客户端的步数')
+    args = parser.parse_args()
+
+    kind, address = parse_address(args.tcp, args.unix)
+    asyncio.run(load_test(kind, address, args.clients, args.steps))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+模拟服务器的二进制协议（不依赖 pygame，客户端可单独使用）
+
+客户端 -> 服务器：每次请求 1 字节
+    bit 0-3: 动作 [左转, 右转, 推进, 反向推进]
+    bit 7:   重置本局
+服务器 -> 客户端：每次请求返回一个定长观测（小端序）
+    uint8   状态码（见 STATUS_CODES）
+    uint32  逻辑帧数
+    float32 x 9: 飞船 x, y, vx, vy, 旋转角, 目标 x, y, 干扰行星 x, y
+"""
+import struct
+
+ACTION_BITS = 4
+RESET_FLAG = 0x80
+
+OBSERVATION = struct.Struct('<BI9f')
+OBSERVATION_SIZE = OBSERVATION.size
+
+# 状态码顺序即编码值
+STATUS_CODES = (
+    'playing',
+    'success',
+    'timeout',
+    'out_of_bounds',
+    'star_collision',
+    'disturber_collision',
+    'collision',      # 着陆速度过快（原状态为 'collision:<速度>m/s'）
+    'bad_angle',
+    'ship_collision'  # 多飞船共享世界中飞船相撞
+)
+STATUS_INDEX = {name: i for i, name in enumerate(STATUS_CODES)}
+
+
+def encode_action(actions, reset=False):
+    """将动作列表编码为 1 字节请求"""
+    mask = 0
+    for i in range(ACTION_BITS):
+        if actions[i]:
+            mask |= 1 << i
+    if reset:
+        mask |= RESET_FLAG
+    return bytes((mask,))
+
+
+def decode_action(byte):
+    """解码 1 字节请求，返回 (动作列表, 是否重置)"""
+    actions = [bool(byte & (1 << i)) for i in range(ACTION_BITS)]
+    return actions, bool(byte & RESET_FLAG)
+
+
+def encode_status(status):
+    """将 GameCore.update 返回的状态字符串编码为状态码"""
+    return STATUS_INDEX[status.split(':', 1)[0]]
+
+
+def pack_observation(status, tick, ship, target, disturber):
+    """打包观测"""
+    return OBSERVATION.pack(
+        encode_status(status), tick,
+        ship['pos'][0], ship['pos'][1],
+        ship['velocity'][0], ship['velocity'][1],
+        ship['rotation'],
+        target['pos'][0], target['pos'][1],
+        disturber['pos'][0], disturber['pos'][1]
+    )
+
+
+def unpack_observation(data):
+    """解包观测，返回字典"""
+    (code, tick, x, y, vx, vy, rotation,
+     target_x, target_y, disturber_x, disturber_y) = OBSERVATION.unpack(data)
+    return {
+        'status': STATUS_CODES[code],
+        'tick': tick,
+        'pos': [x, y],
+        'velocity': [vx, vy],
+        'rotation': rotation,
+        'target_pos': [target_x, target_y],
+        'disturber_pos': [disturber_x, disturber_y]
+    }
+
+
+def parse_address(tcp=None, unix=None):
+    """解析命令行地址参数，返回 ('tcp', (host, port)) 或 ('unix', path)"""
+    if unix:
+        return 'unix', unix
+    host, _, port = (tcp or '127.0.0.1:7777').rpartition(':')
+    return 'tcp', (host or '127.0.0.1', int(port))
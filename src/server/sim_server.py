@@ -0,0 +1,217 @@
+"""
+本地 asyncio 模拟服务器：为多个客户端托管独立的 GameCore 对局
+
+用法（在 src 目录下）：
+    python -m server.sim_server --tcp 127.0.0.1:7777
+    python -m server.sim_server --unix /tmp/gravityslingshot.sock
+"""
+import argparse
+import asyncio
+import os
+import numpy as np
+from environment.space_env import SpaceEnv
+from core.game_core import GameCore
+from environment import kernels
+from server.protocol import OBSERVATION_SIZE, decode_action, pack_observation, parse_address
+
+
+class Episode:
+    """单个客户端的对局"""
+
+    def __init__(self, writer, seed=None):
+        self.writer = writer
+        # 服务器只推进单艘飞船：轻量无界面环境，不含其他飞船
+        self.env = SpaceEnv(seed=seed, headless=True, fleet_size=0)
+        self.core = GameCore(self.env, tick_clock=True)
+        self.resume = asyncio.Event()  # 积压的请求被处理后置位，恢复读取
+
+    def reply(self, status):
+        """写回打包后的观测；对局结束时自动重置"""
+        self.writer.write(pack_observation(status, self.env.tick, self.env.ship,
+                                           self.env.target, self.env.disturber))
+        if status != 'playing':
+            self.core.reset()
+
+
+class SimServer:
+    """
+    汇集各客户端的待处理动作，每个节拍批量推进所有对局
+    每一轮中每个对局最多推进一步：计时、重置和打包逐对局处理，
+    物理部分把所有对局的飞船放进同一组数组，一次内核调用完成
+    """
+
+    def __init__(self, tick_interval=0.0, max_steps_per_tick=64, max_backlog=4096):
+        """
+        :param tick_interval: 节拍间隔（秒），0 表示有请求即处理
+        :param max_steps_per_tick: 每个对局每个节拍最多处理的请求数，其余留到下一节拍
+        :param max_backlog: 单个对局积压的请求达到该数量时暂停读取该客户端
+        """
+        self.tick_interval = tick_interval
+        self.max_steps_per_tick = max_steps_per_tick
+        self.max_backlog = max_backlog
+        self.pending = {}  # 对局 -> 待处理的请求字节
+        self.episodes = set()
+        self._wakeup = asyncio.Event()
+        self.ticks = 0
+        self.steps = 0
+
+        # 批量物理缓冲区（按需扩容，复用）
+        self._capacity = 0
+        self._allocate(64)
+
+    def _allocate(self, capacity):
+        self._capacity = capacity
+        self._pos = np.zeros((capacity, 2))
+        self._vel = np.zeros((capacity, 2))
+        self._rot = np.zeros(capacity)
+        self._actions = np.zeros((capacity, 4), dtype=np.bool_)
+        self._params = np.zeros((capacity, kernels.N_PARAMS))
+        self._status = np.zeros(capacity, dtype=np.int8)
+        self._rel_speed = np.zeros(capacity)
+
+    async def handle_client(self, reader, writer):
+        """读取客户端请求并放入待处理队列（支持流水线发送多个请求）"""
+        episode = Episode(writer)
+        self.episodes.add(episode)
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                self.pending.setdefault(episode, bytearray()).extend(data)
+                self._wakeup.set()
+                # 流水线请求积压过多、或客户端不读取回复导致写缓冲区超过高水位时，
+                # 只暂停读取该客户端；节拍循环不等待任何单个客户端
+                while len(self.pending.get(episode, b'')) >= self.max_backlog:
+                    episode.resume.clear()
+                    await episode.resume.wait()
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.episodes.discard(episode)
+            self.pending.pop(episode, None)
+            writer.close()
+
+    def step_round(self, group):
+        """
+        推进一轮：每个对局一个请求，物理用一次 step_ships 调用
+        :param group: [(对局, 请求字节), ...]，对局互不相同
+        """
+        if len(group) > self._capacity:
+            self._allocate(max(len(group), self._capacity * 2))
+        pos, vel, rot = self._pos, self._vel, self._rot
+        actions_buf, params = self._actions, self._params
+
+        stepping = []
+        for episode, byte in group:
+            actions, reset = decode_action(byte)
+            if reset:
+                episode.core.reset()
+            timeout = episode.core.advance()
+            if timeout is not None:
+                episode.reply(timeout)
+                continue
+            k = len(stepping)
+            env = episode.env
+            ship = env.ship
+            pos[k] = ship['pos']
+            vel[k] = ship['velocity']
+            rot[k] = ship['rotation']
+            actions_buf[k] = actions
+            params[k] = env.physics_params()
+            stepping.append(episode)
+
+        n = len(stepping)
+        if n:
+            # 所有对局的天体与引力场配置相同，取第一个对局的即可
+            env = stepping[0].env
+            status, rel_speed = kernels.step_ships(
+                pos[:n], vel[:n], rot[:n], actions_buf[:n], params[:n],
+                env.body_pos, env.body_gm, env.body_radius,
+                field=env.field_arrays(),
+                out_status=self._status[:n], out_rel_speed=self._rel_speed[:n]
+            )
+            for k, (episode, p, v, r, code, speed) in enumerate(zip(
+                    stepping, pos[:n].tolist(), vel[:n].tolist(), rot[:n].tolist(),
+                    status.tolist(), rel_speed.tolist())):
+                ship = episode.env.ship
+                ship['pos'][0], ship['pos'][1] = p
+                ship['velocity'][0], ship['velocity'][1] = v
+                ship['rotation'] = r
+                episode.reply(GameCore.status_name(code, speed))
+        self.steps += len(group)
+
+    def step_batch(self, batch):
+        """
+        推进一个节拍收集到的请求，同一对局的多个请求按顺序分轮处理
+        :param batch: {对局: 请求字节}
+        :return: 未处理完的请求 {对局: 剩余字节}
+        """
+        items = [(episode, data) for episode, data in batch.items() if episode in self.episodes]
+        rounds = 0
+        while items and rounds < self.max_steps_per_tick:
+            self.step_round([(episode, data[rounds]) for episode, data in items])
+            rounds += 1
+            items = [(episode, data) for episode, data in items if len(data) > rounds]
+        return {episode: data[rounds:] for episode, data in items}
+
+    async def run_ticks(self):
+        """节拍循环"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if self.tick_interval > 0:
+                await asyncio.sleep(self.tick_interval)  # 收集更多请求
+            else:
+                await asyncio.sleep(0)  # 让出一次，使同时就绪的客户端入队
+
+            batch, self.pending = self.pending, {}
+            leftover = self.step_batch(batch)
+            self.ticks += 1
+            for episode in batch:
+                episode.resume.set()
+            if leftover:
+                # 超出单节拍上限的请求放回队首，保持每个对局的请求顺序
+                for episode, data in leftover.items():
+                    data.extend(self.pending.get(episode, b''))
+                    self.pending[episode] = data
+                self._wakeup.set()
+
+    async def serve(self, kind, address):
+        """启动服务器并持续运行"""
+        if kind == 'unix':
+            if os.path.exists(address):
+                os.unlink(address)
+            server = await asyncio.start_unix_server(self.handle_client, path=address)
+        else:
+            server = await asyncio.start_server(self.handle_client, *address)
+        kernels.warmup()
+        ticker = asyncio.create_task(self.run_ticks())
+        print(f"Serving on {kind}:{address} (observation {OBSERVATION_SIZE} bytes, "
+              f"physics backend: {kernels.BACKEND})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            ticker.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gravity slingshot simulation server')
+    parser.add_argument('--tcp', help='HOST:PORT（默认 127.0.0.1:7777）')
+    parser.add_argument('--unix', help='Unix 套接字路径')
+    parser.add_argument('--tick-interval', type=float, default=0.0,
+                        help='节拍间隔（秒），0 表示有请求即处理')
+    args = parser.parse_args()
+
+    kind, address = parse_address(args.tcp, args.unix)
+    sim = SimServer(tick_interval=args.tick_interval)
+    try:
+        asyncio.run(sim.serve(kind, address))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
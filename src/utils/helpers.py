@@ -0,0 +1,42 @@
+import numpy as np
+
+# PCG64 状态按 32 位字拆分（state 和 inc 各 4 个字 + has_uint32 + uinteger），
+# 每个字都能在 float64 中精确表示
+RNG_STATE_WORDS = 10
+_MASK32 = 0xFFFFFFFF
+
+
+def _split128(value):
+    return [(value >> shift) & _MASK32 for shift in (96, 64, 32, 0)]
+
+
+def _join128(words):
+    value = 0
+    for word in words:
+        value = (value << 32) | int(word)
+    return value
+
+
+def pack_rng_state(rng, out):
+    """
+    将 numpy Generator（PCG64）的状态写入缓冲区
+    :param rng: np.random.Generator
+    :param out: 长度为 RNG_STATE_WORDS 的 float64 数组（视图）
+    """
+    state = rng.bit_generator.state
+    pcg = state['state']
+    out[:] = _split128(pcg['state']) + _split128(pcg['inc']) + [state['has_uint32'], state['uinteger']]
+
+
+def unpack_rng_state(rng, words):
+    """
+    从缓冲区恢复 numpy Generator（PCG64）的状态
+    :param words: pack_rng_state 写入的 RNG_STATE_WORDS 个数
+    """
+    words = np.asarray(words).astype(np.int64).tolist()
+    rng.bit_generator.state = {
+        'bit_generator': 'PCG64',
+        'state': {'state': _join128(words[0:4]), 'inc': _join128(words[4:8])},
+        'has_uint32': words[8],
+        'uinteger': words[9]
+    }
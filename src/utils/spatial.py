@@ -0,0 +1,139 @@
+import math
+import numpy as np
+
+
+class SpatialGrid:
+    """
+    均匀网格空间索引
+    每个对象按其包围盒登记到覆盖的所有网格中，查询矩形区域时只检查相交的网格
+    """
+
+    def __init__(self, cell_size):
+        """
+        :param cell_size: 网格边长（世界坐标）
+        """
+        self.cell_size = float(cell_size)
+        self.cells = {}
+        self.count = 0
+
+    def _cell_range(self, x0, y0, x1, y1):
+        c = self.cell_size
+        return (int(math.floor(x0 / c)), int(math.floor(y0 / c)),
+                int(math.floor(x1 / c)), int(math.floor(y1 / c)))
+
+    def insert(self, index, pos, radius=0):
+        """
+        登记一个对象
+        :param index: 对象编号（查询时返回）
+        :param pos: 中心位置 [x, y]
+        :param radius: 包围半径
+        """
+        cx0, cy0, cx1, cy1 = self._cell_range(
+            pos[0] - radius, pos[1] - radius, pos[0] + radius, pos[1] + radius)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self.cells.setdefault((cx, cy), []).append(index)
+        self.count += 1
+
+    @classmethod
+    def from_points(cls, positions, cell_size, radii=None):
+        """
+        批量构建索引
+        :param positions: 形状 (N, 2) 的位置数组
+        :param radii: 可选的半径数组
+        """
+        grid = cls(cell_size)
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        if radii is None:
+            # 点对象只落在一个网格中，可整体计算网格坐标
+            cells = np.floor(positions / grid.cell_size).astype(np.int64)
+            for i, (cx, cy) in enumerate(cells.tolist()):
+                grid.cells.setdefault((cx, cy), []).append(i)
+            grid.count = len(positions)
+        else:
+            for i, (pos, r) in enumerate(zip(positions.tolist(), np.asarray(radii).tolist())):
+                grid.insert(i, pos, r)
+        for key, items in grid.cells.items():
+            grid.cells[key] = np.array(items, dtype=np.intp)
+        return grid
+
+    def query_rect(self, x0, y0, x1, y1):
+        """
+        查询与矩形 [x0, x1] x [y0, y1] 所在网格相交的对象
+        结果是候选集合（可能包含矩形外但同一网格内的对象）
+        :return: 去重后的编号数组
+        """
+        cx0, cy0, cx1, cy1 = self._cell_range(x0, y0, x1, y1)
+        found = []
+        # 查询范围大于已登记网格数时直接遍历已登记网格
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            for (cx, cy), items in self.cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    found.append(items)
+        else:
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    items = self.cells.get((cx, cy))
+                    if items is not None:
+                        found.append(items)
+        if not found:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate([np.asarray(items, dtype=np.intp) for items in found]))
+
+
+# 半邻域偏移：与自身网格及四个相邻网格配对，每对网格只检查一次
+_HALF_NEIGHBORHOOD = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+def find_close_pairs(positions, distance, cell_size=None):
+    """
+    空间哈希查找距离小于 distance 的所有点对（向量化，无需两两比较）
+    :param positions: 形状 (N, 2) 的位置数组
+    :param distance: 判定距离
+    :param cell_size: 哈希网格边长，默认等于 distance
+    :return: (i, j) 两个编号数组，满足 i < j
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    n = len(positions)
+    if n < 2:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    cell_size = distance if cell_size is None else cell_size
+
+    cells = np.floor(positions / cell_size).astype(np.int64)
+    # 将二维网格坐标编码为一维键
+    span = int(cells[:, 1].max() - cells[:, 1].min()) + 3
+    cy_min = cells[:, 1].min() - 1
+    keys = cells[:, 0] * span + (cells[:, 1] - cy_min)
+    # 在按键排序后的空间中查找，邻居查询键同样有序，二分查找更快
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    sorted_pos = positions[order]
+
+    limit = distance * distance
+    found_i = []
+    found_j = []
+    for ox, oy in _HALF_NEIGHBORHOOD:
+        neighbor_keys = sorted_keys + (ox * span + oy)
+        lo = np.searchsorted(sorted_keys, neighbor_keys, side='left')
+        hi = np.searchsorted(sorted_keys, neighbor_keys, side='right')
+        counts = hi - lo
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        # 展开每个点在邻居网格中的候选
+        i = np.repeat(np.arange(n), counts)
+        j = np.repeat(lo - (np.cumsum(counts) - counts), counts) + np.arange(total)
+        if ox == 0 and oy == 0:
+            keep = i < j
+            i, j = i[keep], j[keep]
+        d = sorted_pos[i] - sorted_pos[j]
+        close = (d * d).sum(axis=1) < limit
+        i, j = order[i[close]], order[j[close]]
+        found_i.append(np.minimum(i, j))
+        found_j.append(np.maximum(i, j))
+
+    if not found_i:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    return np.concatenate(found_i), np.concatenate(found_j)